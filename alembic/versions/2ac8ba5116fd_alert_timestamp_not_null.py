@@ -0,0 +1,43 @@
+"""alert timestamp not null
+
+Revision ID: 2ac8ba5116fd
+Revises: b59074d241cc
+Create Date: 2026-10-17 03:17:43.557328
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ac8ba5116fd'
+down_revision: Union[str, None] = 'b59074d241cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# rows that never got a time sort as the oldest alerts
+BACKFILL = datetime(1970, 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return  # fresh database: create_all builds the column NOT NULL
+    timestamp = next(c for c in inspector.get_columns('alerts') if c['name'] == 'timestamp')
+    if not timestamp['nullable']:
+        return
+    alerts = sa.table('alerts', sa.column('timestamp', sa.DateTime()))
+    op.execute(alerts.update().where(alerts.c.timestamp.is_(None)).values(timestamp=BACKFILL))
+    with op.batch_alter_table('alerts') as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('alerts') as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=True)
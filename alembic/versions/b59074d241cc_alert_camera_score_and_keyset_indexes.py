@@ -0,0 +1,65 @@
+"""alert camera/score columns and keyset pagination indexes
+
+Revision ID: b59074d241cc
+Revises: 65ab2b397192
+Create Date: 2026-10-17 02:41:27.318204
+
+The earlier revisions are empty: the tables come from the app's
+create_all at startup. So this revision only adds what is missing. On a
+fresh database it does nothing, and create_all later builds the current
+schema. On a database that create_all already built from these models,
+the columns and indexes are skipped. Either way
+`alembic upgrade head` (or `alembic stamp head`) leaves it at head.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b59074d241cc'
+down_revision: Union[str, None] = '65ab2b397192'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    'ix_alerts_timestamp_id':        ['timestamp', 'id'],
+    'ix_alerts_user_timestamp_id':   ['user_id', 'timestamp', 'id'],
+    'ix_alerts_camera_timestamp_id': ['camera_id', 'timestamp', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+    columns = {c['name'] for c in inspector.get_columns('alerts')}
+    missing = [
+        column for column in (
+            sa.Column('camera_id', sa.Integer(), nullable=True),
+            sa.Column('score', sa.Float(), nullable=True),
+        )
+        if column.name not in columns
+    ]
+    if missing:
+        with op.batch_alter_table('alerts') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+    indexes = {i['name'] for i in inspector.get_indexes('alerts')}
+    for name, columns in INDEXES.items():
+        if name not in indexes:
+            op.create_index(name, 'alerts', columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alerts_camera_timestamp_id', table_name='alerts')
+    op.drop_index('ix_alerts_user_timestamp_id', table_name='alerts')
+    op.drop_index('ix_alerts_timestamp_id', table_name='alerts')
+    with op.batch_alter_table('alerts') as batch_op:
+        batch_op.drop_column('score')
+        batch_op.drop_column('camera_id')
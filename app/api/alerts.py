@@ -1,23 +1,73 @@
 # app/api/alerts.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, tuple_
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import DBSession, get_session
 from app.db.models import Alert, User           # ← add User here
-from app.schemas.alert import AlertRead, AlertCreate
+from app.schemas.alert import AlertRead, AlertCreate, AlertPage
 from app.api.auth import get_current_active_user
 
 router = APIRouter()
 
-@router.get("/", response_model=List[AlertRead])
-def list_alerts(db: Session = Depends(get_db)):
-    return db.query(Alert).all()
+
+def encode_cursor(alert: Alert) -> str:
+    raw = f"{alert.timestamp.isoformat()}|{alert.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, alert_id = raw.split("|")
+        return datetime.fromisoformat(ts), int(alert_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+@router.get("/", response_model=AlertPage)
+async def list_alerts(
+    limit:     int = Query(settings.ALERTS_PAGE_SIZE, ge=1, le=settings.ALERTS_MAX_PAGE_SIZE),
+    cursor:    Optional[str] = Query(None, description="next_cursor from the previous page"),
+    since:     Optional[datetime] = Query(None, description="only alerts at or after this time"),
+    until:     Optional[datetime] = Query(None, description="only alerts before this time"),
+    user_id:   Optional[int] = None,
+    camera_id: Optional[int] = None,
+    db: DBSession = Depends(get_session),
+):
+    """
+    Alerts newest first, one page at a time. Pages are keyed on
+    (timestamp, id) so every page is an index range scan, however deep.
+    """
+    query = select(Alert)
+    if since is not None:
+        query = query.where(Alert.timestamp >= since)
+    if until is not None:
+        query = query.where(Alert.timestamp < until)
+    if user_id is not None:
+        query = query.where(Alert.user_id == user_id)
+    if camera_id is not None:
+        query = query.where(Alert.camera_id == camera_id)
+    if cursor is not None:
+        query = query.where(tuple_(Alert.timestamp, Alert.id) < decode_cursor(cursor))
+
+    query = (
+        query.order_by(Alert.timestamp.desc(), Alert.id.desc())
+        .limit(limit + 1)  # one extra row tells us whether there is a next page
+    )
+    rows = (await db.execute(query)).scalars().all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.post("/", response_model=AlertRead, status_code=status.HTTP_201_CREATED)
-def create_alert(
+async def create_alert(
     data: AlertCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_active_user),
 ):
     alert = Alert(
@@ -25,7 +75,7 @@ def create_alert(
         user_id=current_user.id,
     )
     db.add(alert)
-    db.commit()
-    db.refresh(alert)
+    await db.commit()
+    await db.refresh(alert)
     return alert
 
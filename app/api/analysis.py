@@ -0,0 +1,40 @@
+# app/api/analysis.py
+import os
+import shutil
+import uuid
+from typing import List
+
+from fastapi import APIRouter, File, HTTPException, UploadFile, status
+
+from app.core.config import settings
+from app.services.batch_analysis import jobs
+
+router = APIRouter()
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+def submit_analysis(file: UploadFile = File(...)):
+    """Upload a recorded video and queue it for offline analysis."""
+    os.makedirs(settings.ANALYSIS_UPLOAD_DIR, exist_ok=True)
+    ext  = os.path.splitext(file.filename or "")[1] or ".mp4"
+    path = os.path.join(settings.ANALYSIS_UPLOAD_DIR, f"{uuid.uuid4().hex}{ext}")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out)
+    try:
+        return jobs.submit(path, delete_file=True)
+    except Exception:
+        os.remove(path)
+        raise
+
+
+@router.get("/", response_model=List[dict])
+def list_analyses():
+    return jobs.list()
+
+
+@router.get("/{job_id}")
+def get_analysis(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,28 +1,45 @@
 # app/api/auth.py
 
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 from jose import JWTError, jwt
 
 from app.core.config        import settings
-from app.db.session        import get_db
+from app.db.session        import DBSession, get_session
 from app.db.models         import User, UserRole
 from app.schemas.user      import UserCreate, UserRead
 from app.schemas.auth      import ResetRequest, ResetPassword
 from app.schemas.token     import Token, TokenPayload
-from app.services.security import (
-    get_password_hash,
-    authenticate_user,
-    create_access_token,
-)
+from app.services.security import create_access_token
+from app.services.hashing  import hash_password_async, verify_and_update_async
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
+async def authenticate_user(db: DBSession, email: str, password: str) -> Optional[User]:
+    """
+    Fetch user by email and verify the password on the hashing pool,
+    re-hashing it if it was stored with outdated Argon2 parameters.
+    """
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_async(password, user.password_hash)
+    if not valid:
+        return None
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    return user
+
+
 @router.post("/signup", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def signup(data: UserCreate, db: Session = Depends(get_db)):
+async def signup(data: UserCreate, db: DBSession = Depends(get_session)):
     """
     - Anyone can sign up as a 'user'.
     - Only the very first 'admin' may be created; thereafter, no self-admin signup.
@@ -38,7 +55,9 @@ def signup(data: UserCreate, db: Session = Depends(get_db)):
 
     # 2) If it's an admin signup, ensure none exist yet
     if role_enum is UserRole.admin:
-        existing = db.query(User).filter(User.role == UserRole.admin).count()
+        existing = await db.scalar(
+            select(func.count()).select_from(User).where(User.role == UserRole.admin)
+        )
         if existing > 0:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -46,7 +65,7 @@ def signup(data: UserCreate, db: Session = Depends(get_db)):
             )
 
     # 3) Prevent duplicate emails
-    if db.query(User).filter_by(email=data.email).first():
+    if await db.scalar(select(User.id).where(User.email == data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -55,22 +74,22 @@ def signup(data: UserCreate, db: Session = Depends(get_db)):
     # 4) Create & return
     user = User(
         email=data.email,
-        password_hash=get_password_hash(data.password),
+        password_hash=await hash_password_async(data.password),
         role=role_enum,
         is_active=True,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,9 +102,9 @@ def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db:    Session = Depends(get_db),
+    db:    DBSession = Depends(get_session),
 ) -> User:
     credentials_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -98,9 +117,15 @@ def get_current_user(
     except JWTError:
         raise credentials_exc
 
-    user = db.get(User, int(data.sub))
+    cached = user_cache.get(int(data.sub))
+    if cached is not None:
+        # attach the cached row to this session without a query
+        return await db.merge(cached, load=False)
+
+    user = await db.get(User, int(data.sub))
     if not user:
         raise credentials_exc
+    user_cache.put(user)
     return user
 
 
@@ -117,24 +142,24 @@ def get_current_active_admin(current_user: User = Depends(get_current_user)) ->
 
 
 @router.post("/forgot-password", status_code=status.HTTP_202_ACCEPTED)
-def forgot_password(data: ResetRequest, db: Session = Depends(get_db)):
+async def forgot_password(data: ResetRequest, db: DBSession = Depends(get_session)):
     # Always 202 to avoid email enumeration
-    _ = db.query(User).filter_by(email=data.email).first()
+    _ = await db.scalar(select(User).where(User.email == data.email))
     return {"msg": "If that email is registered, a reset link has been sent."}
 
 
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
-def reset_password(data: ResetPassword, db: Session = Depends(get_db)):
+async def reset_password(data: ResetPassword, db: DBSession = Depends(get_session)):
     try:
         decoded = jwt.decode(data.token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         user_id: int = int(decoded.get("sub"))
     except JWTError:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid reset token")
 
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "User not found")
 
-    user.password_hash = get_password_hash(data.new_password)
-    db.commit()
+    user.password_hash = await hash_password_async(data.new_password)
+    await db.commit()
     return {"msg": "Password reset successful"}
@@ -0,0 +1,36 @@
+# app/api/snapshots.py
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.services.snapshot_store import snapshot_store
+
+router = APIRouter()
+
+
+def _serve(request: Request, digest: str, thumb: bool) -> Response:
+    path = snapshot_store.find(digest, thumb)
+    if path is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Snapshot not found")
+    # content-addressed: the digest is a strong validator and the bytes never change
+    etag = f'"{digest}{"-thumb" if thumb else ""}"'
+    headers = {
+        "ETag":          etag,
+        "Cache-Control": f"private, max-age={settings.SNAPSHOT_MAX_AGE}, immutable",
+    }
+    if etag in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # FileResponse handles Range / If-Range
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+
+@router.get("/{digest}")
+def get_snapshot(digest: str, request: Request):
+    """Full-size alert snapshot."""
+    return _serve(request, digest, thumb=False)
+
+
+@router.get("/{digest}/thumb")
+def get_snapshot_thumbnail(digest: str, request: Request):
+    """Small thumbnail for alert galleries."""
+    return _serve(request, digest, thumb=True)
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.services.security import get_current_active_user, is_admin, hash_password
+from app.services.hashing import hasher
 from app.schemas.user import UserCreate, UserOut
 from app.db.models import User
 
@@ -25,7 +26,7 @@ def create_user(
     # 3. Create & save
     new_user = User(
         email=user_in.email,
-        hashed_password=hash_password(user_in.password),
+        password_hash=hasher.call(hash_password, user_in.password),
         role=user_in.role,        # e.g. "admin" or "user"
         is_active=True,
     )
@@ -10,6 +10,27 @@ class Settings(BaseSettings):
 
        # Database (default to a local SQLite file)
     DATABASE_URL: str = "sqlite:///./violence_db.sqlite"
+    DB_ASYNC: bool = False             # alerts/auth routers on an async engine (needs aiosqlite/asyncpg)
+    DB_POOL_SIZE: int = 5              # connections kept open per engine
+    DB_MAX_OVERFLOW: int = 10          # extra connections under burst load
+    DB_POOL_TIMEOUT: float = 30.0      # seconds to wait for a free connection
+    SQLITE_WAL: bool = True            # readers don't block the writer (and vice versa)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000 # wait on a locked database instead of failing
+    SQLITE_SYNCHRONOUS: str = "NORMAL" # safe with WAL, far fewer fsyncs than FULL
+
+    # Alerts listing
+    ALERTS_PAGE_SIZE: int = 50       # default page size for GET /alerts/
+    ALERTS_MAX_PAGE_SIZE: int = 500  # hard cap on ?limit=
+
+    # Alerts raised by the detector (written in batches in the background)
+    ALERT_LEVEL: str = "urgent"          # "warning", "urgent", or "" to disable
+    ALERT_COOLDOWN_SECONDS: float = 30.0 # per camera, between automatic alerts
+    SNAPSHOT_DIR: str = "data/snapshots" # content-addressed alert images
+    SNAPSHOT_THUMB_WIDTH: int = 160      # px, for alert galleries
+    SNAPSHOT_MAX_AGE: int = 31536000     # Cache-Control max-age; snapshots never change
+    ALERT_QUEUE_MAX: int = 256           # alerts waiting to be written; more are dropped
+    ALERT_BATCH_MAX: int = 100           # rows per transaction
+    ALERT_FLUSH_SECONDS: float = 0.5     # how long the writer coalesces a batch
 
 
     # JWT / Auth
@@ -21,17 +42,96 @@ class Settings(BaseSettings):
     # 2FA (TOTP)
     TWOFA_ISSUER: str = "ViolenceDetector"
 
+    # Authenticated user lookups (skips the DB on most requests)
+    USER_CACHE_SIZE: int = 1024     # users kept; least recently used dropped first
+    USER_CACHE_TTL: float = 60.0    # seconds; 0 disables the cache
+
+    # Password hashing (Argon2). Changing the costs re-hashes on next login.
+    ARGON2_TIME_COST: int = 3        # iterations
+    ARGON2_MEMORY_COST: int = 65536  # KiB per hash
+    ARGON2_PARALLELISM: int = 4      # lanes per hash
+    HASH_WORKERS: int = 2            # hashes computed at once
+    HASH_QUEUE_MAX: int = 16         # hashes allowed to wait; beyond that → 503
+    HASH_RETRY_AFTER: int = 2        # seconds, sent with the 503
+
     # Detector configuration
     CAMERA_INDICES: List[int] = [0]
     SEQ_LEN: int = 1
     MAX_PEOPLE: int = 2
     SMOOTHING_WINDOW: int = 5
+    SMOOTHING_MODE: str = "mean"   # "mean" over the window or "ema"
+    SMOOTHING_ALPHA: float = 0.0   # EMA factor; 0 = 2 / (SMOOTHING_WINDOW + 1)
+
+    # Inference backend: "tf" (TensorFlow) or "tflite" (converted, quantized)
+    INFERENCE_BACKEND: str = "tf"
+    TFLITE_THREADS: int = 0            # per interpreter; 0 = one per CPU core
+    TFLITE_POSE_PATH: str = "models/movenet_multipose_lightning.tflite"
+    TFLITE_CLASSIFIER_PATH: str = "models/violence_transformer.tflite"
+
+    # Adaptive quality (per camera)
+    GOVERNOR_ENABLED: bool = True
+    FRAME_BUDGET_MS: float = 66.0      # target processing time per frame (~15 fps)
+    POSE_INPUT_MIN: int = 160          # MoveNet input side floor (multiple of 32)
+    POSE_INPUT_MAX: int = 256          # MoveNet input side ceiling
+    INFERENCE_STRIDE_MIN: int = 1      # run inference every Nth frame, at best...
+    INFERENCE_STRIDE_MAX: int = 4      # ...and at worst
+
+    # Motion / presence gating (skip idle frames)
+    MOTION_GATE_ENABLED: bool = True
+    MOTION_WIDTH: int = 64              # width of the downscaled diff frame
+    MOTION_PIXEL_THRESHOLD: int = 25    # grey-level change that counts as motion
+    MOTION_MIN_AREA: float = 0.01       # fraction of pixels that must change
+    MOTION_KEEPALIVE: int = 15          # keep inferring this many checks after motion
+    MOTION_REFRESH: int = 30            # while gated, still infer every Nth check; 0 = never
+
+    # MJPEG streaming
+    STREAM_BUFFER_FRAMES: int = 2  # per-viewer buffer; older frames are dropped
+    STREAM_JPEG_QUALITY: int = 95  # default when the viewer does not ask (OpenCV's default)
+    STREAM_MIN_WIDTH: int = 64     # smallest width a viewer may request
+
+    # WebSocket score channel
+    WS_SCORE_RATE: float = 10.0    # default max messages/sec per client; 0 = every frame
+    WS_PERSON_SCORE: float = 0.2   # min MoveNet person score to send keypoints
+
+    # Multi-camera supervision
+    INFERENCE_WORKERS: int = 0          # concurrent inferences; 0 = one per CPU core
+    CAMERA_STALL_SECONDS: float = 10.0  # restart a camera with no frame for this long
+
+    # Prometheus metrics (GET /metrics)
+    METRICS_ENABLED: bool = True        # expose /metrics and count HTTP requests
+
+    # On-demand profiling (POST /debug/profile/{camera_id}, admin only)
+    PROFILE_MAX_SECONDS: float = 30.0   # cap on one capture (the TF trace is process-wide)
+    PROFILE_SAMPLE_MS: float = 10.0     # Python stack sampling interval
 
     # Paths (relative to project root)
     NORMAL_DIR: str = "data/non_violence"
     VIOLENT_DIR: str = "data/violence"
     MODEL_PATH: str = "models/violence_transformer_model"
-    FEATURES_PATH: str = "data/extracted_features2.pkl"
+    MOVENET_PATH: str = "models/movenet_multipose_lightning"  # vendored SavedModel
+    MOVENET_URL: str = "https://tfhub.dev/google/movenet/multipose/lightning/1"
+    MOVENET_SHA256: str = ""            # overrides <MOVENET_PATH>/checksum.sha256
+    MOVENET_ALLOW_DOWNLOAD: bool = True # fall back to TF Hub if not vendored
+    FEATURES_PATH: str = "data/pose_features"  # memory-mapped pose feature cache
+
+    # Training feature extraction
+    EXTRACT_DECODE_WORKERS: int = 0    # image decode threads; 0 = one per CPU core
+    EXTRACT_POSE_WORKERS: int = 2      # concurrent MoveNet callers
+    EXTRACT_BATCH_SIZE: int = 32       # images per pose/feature batch
+
+    # Training
+    TRAIN_MODE: str = "auto"           # "images", "clips" (video files), or auto-detect
+    TRAIN_FRAME_STRIDE: int = 1        # use every Nth video frame
+    TRAIN_WINDOW_STRIDE: int = 1       # frames between consecutive training windows
+    TRAIN_SHUFFLE_BUFFER: int = 2048   # windows held in memory for shuffling
+    TRAIN_CACHE_PATH: str = ""         # tf.data disk cache; "" = no cache
+
+    # Offline video analysis
+    ANALYSIS_WORKERS: int = 2          # worker processes
+    ANALYSIS_CHUNK_FRAMES: int = 256   # frames decoded + scored per batch
+    ANALYSIS_FRAME_STRIDE: int = 1     # analyse every Nth frame
+    ANALYSIS_UPLOAD_DIR: str = "data/analysis_uploads"
+    ANALYSIS_JOB_TTL_SECONDS: int = 3600  # finished jobs are forgotten after this
 
     # Detection thresholds
     WARNING_THRESHOLD: float = 0.55
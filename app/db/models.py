@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -28,5 +28,14 @@ class Alert(Base):
     id         = Column(Integer, primary_key=True, index=True)
     user_id    = Column(Integer, ForeignKey("users.id"), nullable=True)
     image_path = Column(String, nullable=False)
-    timestamp  = Column(DateTime, default=datetime.utcnow)
+    timestamp  = Column(DateTime, default=datetime.utcnow, nullable=False)
+    camera_id  = Column(Integer, nullable=True)
+    score      = Column(Float, nullable=True)
     user       = relationship("User", back_populates="alerts")
+
+    # keyset pagination walks (timestamp, id) newest-first, optionally per user/camera
+    __table_args__ = (
+        Index("ix_alerts_timestamp_id", "timestamp", "id"),
+        Index("ix_alerts_user_timestamp_id", "user_id", "timestamp", "id"),
+        Index("ix_alerts_camera_timestamp_id", "camera_id", "timestamp", "id"),
+    )
@@ -1,16 +1,59 @@
 # app/db/session.py
 
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    """create_engine() kwargs for `url`, with pool sizing from Settings."""
+    options: dict = {"pool_pre_ping": not _is_sqlite(url)}
+    if _is_sqlite(url):
+        # busy timeout is also set as a pragma; this covers the connect itself
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+        if _is_memory(url):
+            return options  # single-connection pool; sizing doesn't apply
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def tune_sqlite(engine) -> None:
+    """Apply WAL / busy_timeout / synchronous pragmas on every new connection."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.close()
+
+
 # 1) create the engine pointing at your SQLite file
-#    NOTE: adjust “connect_args” only for SQLite
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+if _is_sqlite(settings.DATABASE_URL):
+    tune_sqlite(engine)
 
 # 2) configure a Session factory, bound to that engine
 SessionLocal = sessionmaker(
@@ -26,3 +69,94 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 4) optional async engine (DB_ASYNC), created on first use
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+_async_engine       = None
+_async_sessionmaker = None
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for {backend!r}")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def get_async_sessionmaker():
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(url, **engine_options(url))
+        if _is_sqlite(url):
+            tune_sqlite(_async_engine.sync_engine)
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (aiosqlite keeps a thread per connection)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine, _async_sessionmaker = None, None
+
+
+class DBSession:
+    """
+    Awaitable facade over either session type, so routers are written once.
+
+    With an AsyncSession every call is awaited on the event loop; with a
+    sync Session the blocking call runs on the threadpool instead of
+    stalling the loop.
+    """
+
+    def __init__(self, session: Any, is_async: bool):
+        self.session  = session
+        self.is_async = is_async
+
+    async def _call(self, fn, *args, **kwargs):
+        if self.is_async:
+            return await fn(*args, **kwargs)
+        return await run_in_threadpool(fn, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await self._call(self.session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement) -> Optional[Any]:
+        return await self._call(self.session.scalar, statement)
+
+    async def get(self, model, ident):
+        return await self._call(self.session.get, model, ident)
+
+    def add(self, obj) -> None:
+        self.session.add(obj)
+
+    async def merge(self, obj, load: bool = True):
+        return await self._call(self.session.merge, obj, load=load)
+
+    async def commit(self) -> None:
+        await self._call(self.session.commit)
+
+    async def refresh(self, obj) -> None:
+        await self._call(self.session.refresh, obj)
+
+    async def close(self) -> None:
+        await self._call(self.session.close)
+
+
+async def get_session() -> AsyncIterator[DBSession]:
+    """Dependency: async session when DB_ASYNC is on, else the sync one off-loop."""
+    if settings.DB_ASYNC:
+        session = DBSession(get_async_sessionmaker()(), is_async=True)
+    else:
+        session = DBSession(SessionLocal(), is_async=False)
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -1,29 +1,39 @@
 # app/main.py
 
+import time
 import logging
-from fastapi import FastAPI, BackgroundTasks, Depends, Request
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, Query, Request, status
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from starlette.routing import Route
 
-import cv2
-import numpy as np
-import tensorflow as tf
-
 from app.core.config       import settings
-from app.services.detector import ViolenceDetector
+from app.services.model_registry import registry
+from app.services.broadcaster    import Rendition, all_broadcasters, get_broadcaster
+from app.services.supervisor     import supervisor
+from app.services.batch_analysis import jobs as analysis_jobs
+from app.services.alert_writer   import alert_writer
+from app.services.user_cache     import user_cache
+from app.services.hashing        import hasher
+from app.services.metrics        import MetricsMiddleware, metrics
+from app.services.profiler       import ProfilerBusy, profiler
+from app.websockets.scores       import router as scores_ws_router
 
 # ─────────── NEW: import your SQLAlchemy Base & engine ────────────────────────
 from app.db.base    import Base
-from app.db.session import engine
+from app.db.session import engine, dispose_async_engine
 
 # Import routers & security dependencies
 from app.api.auth   import router as auth_router, get_current_active_user, get_current_active_admin
 from app.api.users  import router as users_router
 from app.api.alerts import router as alerts_router
+from app.api.analysis import router as analysis_router
+from app.api.snapshots import router as snapshots_router
 
 app = FastAPI(title=settings.APP_NAME)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # ─────────── NEW: ensure DB tables exist on startup ───────────────────────────
 @app.on_event("startup")
@@ -60,106 +70,87 @@ app.include_router(
     dependencies=[Depends(get_current_active_user)],
 )
 
-# 6) MJPEG video stream (public)
-@app.get("/video_feed", tags=["stream"])
-def video_feed():
-    def frame_generator():
-        detector = ViolenceDetector(
-            camera_index=settings.CAMERA_INDICES[0],
-            seq_len=settings.SEQ_LEN,
-            max_people=settings.MAX_PEOPLE,
-            warning_th=settings.WARNING_THRESHOLD,
-            urgent_th=settings.URGENT_THRESHOLD,
-            smoothing_window=settings.SMOOTHING_WINDOW,
-        )
-
-        cap = cv2.VideoCapture(detector.cam, cv2.CAP_DSHOW)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH,  640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        cap.set(cv2.CAP_PROP_FPS,          15)
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # 1) detect poses & extract features
-            poses = detector.pose.detect(frame)
-            feat  = detector.pose.keypoints_to_features(
-                poses[:detector.max_people],
-                frame.shape[:2]
-            )
-            detector.seq_buf.append(feat)
-
-            # 2) infer & smooth once buffer is full
-            label, color = "Gathering…", (0, 255, 255)
-            if len(detector.seq_buf) == detector.seq_len:
-                arr   = np.stack(detector.seq_buf, axis=0)[None, ...]
-                score = float(detector._infer(tf.constant(arr))[0, 0].numpy())
-                detector.pred_buf.append(score)
-                avg   = float(np.mean(detector.pred_buf))
-                if avg >= detector.urgent_th:
-                    label, color = f"🚨 URGENT VIOLENCE ({avg:.2f})", (0, 0, 255)
-                elif avg >= detector.warning_th:
-                    label, color = f"⚠️ Warning ({avg:.2f})",   (0, 165, 255)
-                else:
-                    label, color = f"✔ Normal ({avg:.2f})",    (0, 255, 0)
-
-            # 3) annotate frame
-            out = frame.copy()
-            cv2.putText(out, label, (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
-
-            # 4) yield as MJPEG chunk
-            _, buffer = cv2.imencode(".jpg", out)
-            frame_bytes = buffer.tobytes()
-            yield (
-                b"--frame\r\n"
-                b"Content-Type: image/jpeg\r\n\r\n" +
-                frame_bytes +
-                b"\r\n"
-            )
+# 6) Alert snapshots (Authenticated users, like the alerts they belong to)
+app.include_router(
+    snapshots_router,
+    prefix="/snapshots",
+    tags=["alerts"],
+    dependencies=[Depends(get_current_active_user)],
+)
 
-        cap.release()
+# 7) Offline video analysis (Authenticated users)
+app.include_router(
+    analysis_router,
+    prefix="/analysis",
+    tags=["analysis"],
+    dependencies=[Depends(get_current_active_user)],
+)
 
+# 8) MJPEG video streams (public)
+def _mjpeg_response(camera_id: int, width: int, quality: int, fps: float) -> StreamingResponse:
+    # one shared capture+inference pipeline per camera, fanned out to viewers;
+    # frames reach the response through an asyncio queue, so no worker
+    # thread is parked per viewer and a disconnect releases the camera.
+    # Viewers asking for the same width/quality share one encode per frame.
+    if width and width < settings.STREAM_MIN_WIDTH:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"width must be 0 (native) or at least {settings.STREAM_MIN_WIDTH}",
+        )
+    broadcaster = get_broadcaster(camera_id)
+    subscriber  = broadcaster.subscribe_async(Rendition(width, quality), max_fps=fps)
     return StreamingResponse(
-        frame_generator(),
+        broadcaster.stream_async(subscriber),
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
-# 7) Root UI (Jinja2 template)
+@app.get("/video_feed", tags=["stream"])
+async def video_feed(
+    width:   int   = Query(0, ge=0, le=3840, description="target width in px; 0 = native"),
+    quality: int   = Query(settings.STREAM_JPEG_QUALITY, ge=10, le=100, description="JPEG quality"),
+    fps:     float = Query(0, ge=0, le=60, description="max frames/sec; 0 = every frame"),
+):
+    return _mjpeg_response(settings.CAMERA_INDICES[0], width, quality, fps)
+
+@app.get("/video_feed/{camera_id}", tags=["stream"])
+async def video_feed_camera(
+    camera_id: int,
+    width:   int   = Query(0, ge=0, le=3840, description="target width in px; 0 = native"),
+    quality: int   = Query(settings.STREAM_JPEG_QUALITY, ge=10, le=100, description="JPEG quality"),
+    fps:     float = Query(0, ge=0, le=60, description="max frames/sec; 0 = every frame"),
+):
+    if camera_id not in settings.CAMERA_INDICES:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Unknown camera")
+    return _mjpeg_response(camera_id, width, quality, fps)
+
+# 9) Live detector scores/keypoints over WebSocket (public, like the video feed)
+app.include_router(scores_ws_router, tags=["stream"])
+
+# 10) Root UI (Jinja2 template)
 @app.get("/", tags=["ui"])
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
-# 8) Health check
+# 11) Health check
 @app.get("/healthz", tags=["health"])
 async def healthz():
     return {"status": "ok"}
 
-# 9) Start background violence detection (auth required)
+# 12) Start background violence detection (auth required)
 @app.post("/start-detection", tags=["detection"])
 async def start_detection(
     background_tasks: BackgroundTasks,
     current_user=Depends(get_current_active_user),
 ):
-    detector = ViolenceDetector(
-        camera_index=settings.CAMERA_INDICES[0],
-        seq_len=settings.SEQ_LEN,
-        max_people=settings.MAX_PEOPLE,
-        warning_th=settings.WARNING_THRESHOLD,
-        urgent_th=settings.URGENT_THRESHOLD,
-        smoothing_window=settings.SMOOTHING_WINDOW,
-    )
     background_tasks.add_task(
-        detector.run,
+        supervisor.start_detection,
         settings.NORMAL_DIR,
         settings.VIOLENT_DIR,
         settings.MODEL_PATH,
     )
     return {"message": "Detection started"}
 
-# 10) Log all mounted routes on startup
+# 13) Log all mounted routes on startup
 @app.on_event("startup")
 def log_routes():
     logging.basicConfig(level=logging.INFO)
@@ -169,7 +160,7 @@ def log_routes():
                 f"Route: {route.name:30} → Path: {route.path!r} Methods: {route.methods}"
             )
 
-# 11) Debug helper: dump routes as JSON
+# 14) Debug helper: dump routes as JSON
 @app.get("/debug/routes", include_in_schema=False)
 def debug_routes():
     return [
@@ -177,3 +168,69 @@ def debug_routes():
         for route in app.router.routes
         if isinstance(route, Route)
     ]
+
+# 15) Debug helper: shared model load time & weight memory
+@app.get("/debug/models", include_in_schema=False)
+def debug_models():
+    return registry.stats()
+
+# 16) Per-camera pipeline status (auth required)
+@app.get("/cameras", tags=["detection"])
+def camera_status(current_user=Depends(get_current_active_user)):
+    return supervisor.status()
+
+# 17) Debug helper: background alert writer counters
+@app.get("/debug/alerts", include_in_schema=False)
+def debug_alerts():
+    return alert_writer.stats()
+
+# 18) Debug helper: authenticated-user cache counters
+@app.get("/debug/user-cache", include_in_schema=False)
+def debug_user_cache():
+    return user_cache.stats()
+
+# 19) Debug helper: password-hashing pool (pending / completed / rejected)
+@app.get("/debug/hashing", include_in_schema=False)
+def debug_hashing():
+    return hasher.stats()
+
+# 20) Release every camera on shutdown, then write any queued alerts
+@app.on_event("shutdown")
+def stop_cameras():
+    supervisor.stop()
+    analysis_jobs.shutdown()
+    alert_writer.stop()
+    hasher.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_db():
+    await dispose_async_engine()
+
+# 21) Prometheus metrics: per-camera stage latencies, FPS, queues, alerts, HTTP
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# 22) Debug helper: time-bounded profile of one running camera, as a zip (admin only)
+@app.post("/debug/profile/{camera_id}", include_in_schema=False)
+def profile_camera(
+    camera_id: int,
+    seconds: float = Query(5.0, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(settings.PROFILE_SAMPLE_MS, ge=1, le=1000),
+    trace: bool = Query(False, description="also record a TensorFlow op trace (slows every camera)"),
+    current_user=Depends(get_current_active_admin),
+):
+    broadcaster = all_broadcasters().get(camera_id)
+    if broadcaster is None or not broadcaster.running:
+        raise HTTPException(status.HTTP_409_CONFLICT, f"Camera {camera_id} is not running")
+    try:
+        artifact = profiler.capture(broadcaster, seconds, interval_ms / 1000, trace)
+    except ProfilerBusy as exc:
+        raise HTTPException(status.HTTP_409_CONFLICT, str(exc))
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return Response(
+        artifact,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="profile-camera{camera_id}-{stamp}.zip"'},
+    )
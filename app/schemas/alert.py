@@ -1,7 +1,7 @@
 # app/schemas/alert.py
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -16,6 +16,13 @@ class AlertRead(AlertBase):
     id: int
     timestamp: datetime
     user_id: Optional[int]
+    camera_id: Optional[int] = None
+    score: Optional[float] = None
 
     class Config:
         from_attributes = True
+
+class AlertPage(BaseModel):
+    """One page of alerts, newest first; pass `next_cursor` back as `cursor`."""
+    items: List[AlertRead]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,197 @@
+# app/services/alert_writer.py
+
+import time
+import queue
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.models import Alert
+from app.db.session import SessionLocal
+from app.services.snapshot_store import SnapshotStore, snapshot_store
+from app.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AlertWriter:
+    """
+    Background writer that turns alerts raised on camera threads into
+    batched inserts.
+
+    enqueue() never blocks: alerts go into a bounded queue (dropped and
+    counted when it is full) and a single thread commits whatever has
+    arrived every `interval` seconds, or sooner once `batch_size` alerts
+    are waiting -- one transaction per batch instead of one per alert.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        max_queue: int = settings.ALERT_QUEUE_MAX,
+        batch_size: int = settings.ALERT_BATCH_MAX,
+        interval: float = settings.ALERT_FLUSH_SECONDS,
+        snapshots: Optional[SnapshotStore] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size      = max(batch_size, 1)
+        self.interval        = interval
+        self.snapshots       = snapshots or snapshot_store
+
+        self._q      = queue.Queue(maxsize=max_queue)
+        self._lock   = threading.Lock()
+        self._stop   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.queued  = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed  = 0
+        self.batches = 0
+
+    # --- producers (camera threads) ---
+    def enqueue(
+        self,
+        image_path: Optional[str] = None,
+        image: Optional[bytes] = None,
+        camera_id: Optional[int] = None,
+        score: Optional[float] = None,
+        user_id: Optional[int] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Queue one alert. `image` (JPEG bytes) is stored in the snapshot
+        store by the writer thread and image_path set to its URL.
+        """
+        item = {
+            "image_path": image_path,
+            "image":      image,
+            "camera_id":  camera_id,
+            "score":      score,
+            "user_id":    user_id,
+            "timestamp":  timestamp or datetime.utcnow(),
+        }
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.queued += 1
+        self._ensure_running()
+        return True
+
+    # --- writer thread ---
+    def _ensure_running(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="alert-writer", daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._q.get(timeout=self.interval)
+            except queue.Empty:
+                continue
+            batch    = [first]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+        self.flush()
+
+    def _drain(self) -> List[dict]:
+        items = []
+        while True:
+            try:
+                items.append(self._q.get_nowait())
+            except queue.Empty:
+                return items
+
+    def flush(self) -> None:
+        """Write everything currently queued, in batches, on the caller's thread."""
+        items = self._drain()
+        for start in range(0, len(items), self.batch_size):
+            self._write(items[start:start + self.batch_size])
+
+    def _save_image(self, item: dict) -> str:
+        return f"/snapshots/{self.snapshots.put(item['image'])}"
+
+    def _write(self, batch: List[dict]) -> None:
+        rows = []
+        for item in batch:
+            try:
+                if item["image_path"] is None and item["image"] is not None:
+                    item["image_path"] = self._save_image(item)
+            except OSError:
+                logger.exception("Could not save alert snapshot")
+            if item["image_path"] is None:
+                with self._lock:
+                    self.failed += 1
+                continue
+            rows.append({k: v for k, v in item.items() if k != "image"})
+        if not rows:
+            return
+        try:
+            with self.session_factory() as db:
+                db.execute(insert(Alert), rows)
+                db.commit()
+        except Exception:
+            logger.exception("Failed to write %d alerts", len(rows))
+            with self._lock:
+                self.failed += len(rows)
+            return
+        with self._lock:
+            self.flushed += len(rows)
+            self.batches += 1
+
+    def stop(self) -> None:
+        """Stop the thread after writing whatever is still queued."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=max(self.interval * 4, 5.0))
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued":  self.queued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed":  self.failed,
+                "batches": self.batches,
+                "pending": self._q.qsize(),
+            }
+
+
+alert_writer = AlertWriter()
+
+
+@metrics.collector
+def _alert_metrics():
+    stats = alert_writer.stats()
+
+    def counter(key, help):
+        return f"violence_alerts_{key}_total", "counter", help, [("", {}, stats[key])]
+
+    return [
+        counter("queued",  "Alerts raised by the detector and queued for writing."),
+        counter("flushed", "Alerts written to the database."),
+        counter("dropped", "Alerts dropped because the write queue was full."),
+        counter("failed",  "Alerts lost to a failed batch insert."),
+        ("violence_alerts_pending", "gauge", "Alerts waiting to be written.", [("", {}, stats["pending"])]),
+    ]
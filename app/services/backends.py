@@ -0,0 +1,113 @@
+# app/services/backends.py
+
+import os
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+from app.core.config import settings
+
+try:  # LiteRT is the supported TFLite runtime from TF 2.20 on
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:  # pragma: no cover - depends on the installed runtime
+    Interpreter = tf.lite.Interpreter
+
+BACKENDS = ("tf", "tflite")
+
+
+# --- TENSORFLOW ---
+class TFPoseBackend:
+    """MoveNet through the SavedModel's serving signature."""
+
+    def __init__(self, saved_model):
+        self.model = saved_model
+
+    @tf.function
+    def _infer(self, inp):
+        return self.model.signatures['serving_default'](inp)['output_0']
+
+    def __call__(self, rgb: np.ndarray) -> np.ndarray:
+        inp = tf.cast(rgb, tf.int32)[tf.newaxis, ...]
+        return self._infer(inp).numpy()[0]
+
+
+@tf.function(reduce_retracing=True)
+def _classify(model, seq):
+    # traced once per shared model instance, not once per detector
+    return model(seq, training=False)
+
+
+class TFClassifierBackend:
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self, seq: np.ndarray) -> float:
+        return float(_classify(self.model, tf.convert_to_tensor(seq))[0, 0].numpy())
+
+    def predict_batch(self, seqs: np.ndarray) -> np.ndarray:
+        """(B, seq_len, feat_dim) → (B,) scores in one call."""
+        return _classify(self.model, tf.convert_to_tensor(seqs)).numpy()[:, 0]
+
+
+# --- TFLITE ---
+class TFLiteBackend:
+    """
+    TFLite interpreter with one instance per calling thread (interpreters
+    are not thread-safe), so cameras never serialise on a lock.
+    """
+
+    def __init__(self, model_path: str, num_threads: int = settings.TFLITE_THREADS):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found; build it with scripts/convert_tflite.py"
+            )
+        with open(model_path, "rb") as fh:
+            self.model_content = fh.read()
+        self.model_path  = model_path
+        self.num_threads = num_threads or os.cpu_count() or 1
+        self._local      = threading.local()
+
+    @property
+    def interpreter(self):
+        it = getattr(self._local, "interpreter", None)
+        if it is None:
+            it = Interpreter(model_content=self.model_content, num_threads=self.num_threads)
+            it.allocate_tensors()
+            self._local.interpreter = it
+        return it
+
+    def run(self, inp: np.ndarray) -> np.ndarray:
+        it     = self.interpreter
+        detail = it.get_input_details()[0]
+        if tuple(detail["shape"]) != inp.shape:
+            it.resize_tensor_input(detail["index"], inp.shape)
+            it.allocate_tensors()
+        it.set_tensor(detail["index"], inp.astype(detail["dtype"], copy=False))
+        it.invoke()
+        return it.get_tensor(it.get_output_details()[0]["index"])
+
+    @property
+    def weight_bytes(self) -> int:
+        # the flatbuffer holds the (possibly quantized) weights
+        return len(self.model_content)
+
+
+class TFLitePoseBackend(TFLiteBackend):
+    def __call__(self, rgb: np.ndarray) -> np.ndarray:
+        return self.run(rgb[np.newaxis, ...])[0]
+
+
+class TFLiteClassifierBackend(TFLiteBackend):
+    def __call__(self, seq: np.ndarray) -> float:
+        return float(self.run(np.ascontiguousarray(seq, dtype=np.float32))[0, 0])
+
+    def predict_batch(self, seqs: np.ndarray) -> np.ndarray:
+        return self.run(np.ascontiguousarray(seqs, dtype=np.float32))[:, 0]
+
+
+def selected_backend() -> str:
+    backend = settings.INFERENCE_BACKEND.lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"INFERENCE_BACKEND must be one of {BACKENDS}, got {backend!r}")
+    return backend
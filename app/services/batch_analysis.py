@@ -0,0 +1,285 @@
+# app/services/batch_analysis.py
+
+import os
+import time
+import uuid
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.services.features import poses_to_features
+from app.services.broadcaster import make_detector
+
+logger = logging.getLogger(__name__)
+
+
+# --- ANALYSIS (runs inside a worker process) ---
+def read_chunks(
+    path: str,
+    preprocess: Callable[[np.ndarray], np.ndarray],
+    chunk_frames: int,
+    frame_stride: int = 1,
+) -> Iterator[Tuple[List[np.ndarray], List[Tuple[int, int]], List[int]]]:
+    """
+    Decode a video in chunks of `chunk_frames` kept frames. Each frame is
+    reduced to the pose model's input by `preprocess` as soon as it is
+    read, so a chunk holds (inputs, original (h, w) sizes, frame indices)
+    instead of full-resolution frames.
+    """
+    cap = cv2.VideoCapture(path)
+    inputs, sizes, indices, i = [], [], [], 0
+    try:
+        while cap.grab():
+            if i % frame_stride == 0:
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+                inputs.append(preprocess(frame))
+                sizes.append(frame.shape[:2])
+                indices.append(i)
+                if len(inputs) == chunk_frames:
+                    yield inputs, sizes, indices
+                    inputs, sizes, indices = [], [], []
+            i += 1
+    finally:
+        cap.release()
+    if inputs:
+        yield inputs, sizes, indices
+
+
+def score_windows(classifier, feats: np.ndarray, seq_len: int) -> np.ndarray:
+    """
+    Score every sliding window of `feats` (frames, feat_dim) in one batch.
+    Windows whose newest frame has nobody in view score 0 without
+    running the classifier, as in the live detector.
+    """
+    if len(feats) < seq_len:
+        return np.zeros(0, dtype=np.float32)
+    windows = np.lib.stride_tricks.sliding_window_view(feats, seq_len, axis=0)
+    windows = windows.transpose(0, 2, 1)  # (n, seq_len, feat_dim)
+    scores  = np.zeros(len(windows), dtype=np.float32)
+    present = windows[:, -1].any(axis=1)
+    if present.any():
+        scores[present] = classifier.predict_batch(np.ascontiguousarray(windows[present]))
+    return scores
+
+
+def summarize(
+    frame_idx: np.ndarray,
+    scores: np.ndarray,
+    fps: float,
+    warning_th: float = settings.WARNING_THRESHOLD,
+    urgent_th: float = settings.URGENT_THRESHOLD,
+) -> Tuple[List[dict], List[dict]]:
+    """Per-second timeline (mean/max score) and flagged intervals."""
+    if len(scores) == 0:
+        return [], []
+    seconds = (np.asarray(frame_idx) / (fps or 1.0)).astype(np.int64)
+    timeline = []
+    for sec in np.unique(seconds):
+        s = scores[seconds == sec]
+        timeline.append({"second": int(sec), "mean": round(float(s.mean()), 4), "max": round(float(s.max()), 4)})
+
+    intervals, current = [], None
+    for point in timeline:
+        if point["mean"] >= warning_th:
+            if current is None:
+                current = {"start": point["second"], "end": point["second"] + 1, "peak": point["max"]}
+            else:
+                current["end"]  = point["second"] + 1
+                current["peak"] = max(current["peak"], point["max"])
+        elif current is not None:
+            intervals.append(current)
+            current = None
+    if current is not None:
+        intervals.append(current)
+    for iv in intervals:
+        iv["level"] = "urgent" if iv["peak"] >= urgent_th else "warning"
+    return timeline, intervals
+
+
+def load_detector():
+    """
+    Detector for offline analysis, scoring with the trained classifier.
+
+    Worker processes don't share the server's registry; make_detector
+    loads the saved model into theirs (once per process). Without one
+    the job fails: an untrained transformer would only produce noise.
+    """
+    detector = make_detector(camera_index=None)
+    if not detector.trained and not detector.load_model(settings.MODEL_PATH):
+        raise RuntimeError(
+            f"No trained model at {settings.MODEL_PATH}; train one before analysing videos"
+        )
+    return detector
+
+
+def analyze_video(
+    path: str,
+    chunk_frames: int = settings.ANALYSIS_CHUNK_FRAMES,
+    frame_stride: int = settings.ANALYSIS_FRAME_STRIDE,
+) -> dict:
+    """Full pose + transformer pass over a recorded video file."""
+    start = time.perf_counter()
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    cap.release()
+
+    detector = load_detector()
+    pose, classifier = detector.pose, detector.classifier
+    seq_len = detector.seq_len
+
+    # carry the last seq_len-1 frames over so windows span chunk borders
+    carry_feats = np.zeros((0, detector.feat_dim), dtype=np.float32)
+    carry_idx: List[int] = []
+    all_idx, all_scores, frames = [], [], 0
+    for inputs, sizes, indices in read_chunks(path, pose.preprocess, chunk_frames, frame_stride):
+        poses = np.stack([pose.detect_rgb(rgb) for rgb in inputs])
+        feats = np.concatenate([carry_feats, poses_to_features(poses, np.array(sizes), detector.max_people)])
+        idx   = carry_idx + indices
+        scores = score_windows(classifier, feats, seq_len)
+        all_scores.append(scores)
+        all_idx.extend(idx[seq_len - 1:])
+        carry_feats = feats[-(seq_len - 1):] if seq_len > 1 else feats[:0]
+        carry_idx   = idx[-(seq_len - 1):] if seq_len > 1 else []
+        frames += len(inputs)
+
+    scores = np.concatenate(all_scores) if all_scores else np.zeros(0, dtype=np.float32)
+    timeline, intervals = summarize(
+        np.array(all_idx), scores, fps, detector.warning_th, detector.urgent_th
+    )
+    elapsed = time.perf_counter() - start
+    return {
+        "file":      os.path.basename(path),
+        "fps":       fps,
+        "frames":    frames,
+        "seconds":   round(elapsed, 2),
+        "timeline":  timeline,
+        "intervals": intervals,
+    }
+
+
+# --- JOBS ---
+class AnalysisJobs:
+    """
+    Queue of video analysis jobs on a local process pool.
+
+    Status is queued → running → done / failed; each worker process loads
+    the models once and keeps them for later jobs. Finished jobs are
+    dropped `ttl` seconds after they end.
+    """
+
+    def __init__(
+        self,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+        analyze: Callable[..., dict] = analyze_video,
+        ttl: float = settings.ANALYSIS_JOB_TTL_SECONDS,
+    ):
+        self._executor_factory = executor_factory or self._process_pool
+        self._executor: Optional[Executor] = None
+        self._analyze = analyze
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, dict] = {}
+        self._futures: Dict[str, Future] = {}
+        self._uploads: Dict[str, str] = {}
+
+    @staticmethod
+    def _process_pool() -> Executor:
+        # spawn: forking a process that already initialised TensorFlow is unsafe
+        return ProcessPoolExecutor(
+            max_workers=settings.ANALYSIS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            return self._executor
+
+    def submit(self, path: str, delete_file: bool = False, **options) -> dict:
+        """Queue `path` for analysis; with `delete_file` it is removed once the job ends."""
+        self._prune()
+        job_id = uuid.uuid4().hex
+        job = {
+            "id":           job_id,
+            "file":         os.path.basename(path),
+            "status":       "queued",
+            "submitted_at": time.time(),
+            "result":       None,
+            "error":        None,
+        }
+        future = self.executor.submit(self._analyze, path, **options)
+        with self._lock:
+            self._jobs[job_id]    = job
+            self._futures[job_id] = future
+            if delete_file:
+                self._uploads[job_id] = path
+        future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+        return self.get(job_id)
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job["finished_at"] = time.time()
+            if future.cancelled():
+                job["status"] = "cancelled"
+            elif future.exception() is not None:
+                job["status"] = "failed"
+                job["error"]  = str(future.exception())
+            else:
+                job["status"] = "done"
+                job["result"] = future.result()
+            upload = self._uploads.pop(job_id, None)
+        if upload is not None:
+            try:
+                os.remove(upload)
+            except OSError:
+                logger.warning("Could not delete analysed upload %s", upload, exc_info=True)
+
+    def _prune(self) -> None:
+        """Forget jobs that finished more than `ttl` seconds ago."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.get("finished_at", float("inf")) < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                del self._futures[job_id]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            future = self._futures[job_id]
+            if job["status"] == "queued" and future.running():
+                job["status"] = "running"
+            return dict(job)
+
+    def list(self) -> List[dict]:
+        self._prune()
+        with self._lock:
+            ids = list(self._jobs)
+        return [job for job in map(self.get, ids) if job is not None]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+jobs = AnalysisJobs()
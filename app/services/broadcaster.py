@@ -0,0 +1,544 @@
+# app/services/broadcaster.py
+
+import time
+import queue
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Set
+
+import cv2
+
+from app.core.config import settings
+from app.services.detector  import ViolenceDetector
+from app.services.scheduler import scheduler
+from app.services.alert_writer import alert_writer
+from app.services.metrics   import StageTimer, metrics
+
+logger = logging.getLogger(__name__)
+
+BOUNDARY = b"--frame"
+FPS_SMOOTHING = 0.1  # EWMA weight of the newest inter-frame interval
+
+
+def mjpeg_chunk(jpeg: bytes) -> bytes:
+    return (
+        BOUNDARY + b"\r\n"
+        b"Content-Type: image/jpeg\r\n\r\n" +
+        jpeg +
+        b"\r\n"
+    )
+
+
+def make_detector(camera_index: int) -> ViolenceDetector:
+    """
+    Detector with the trained classifier from MODEL_PATH when one is
+    saved, so a stream opened before /start-detection scores with it.
+    Otherwise it stays untrained until /start-detection trains it.
+    """
+    detector = ViolenceDetector(
+        camera_index=camera_index,
+        seq_len=settings.SEQ_LEN,
+        max_people=settings.MAX_PEOPLE,
+        warning_th=settings.WARNING_THRESHOLD,
+        urgent_th=settings.URGENT_THRESHOLD,
+        smoothing_window=settings.SMOOTHING_WINDOW,
+    )
+    if not detector.trained:
+        detector.load_model(settings.MODEL_PATH)
+    return detector
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """Output size/quality a viewer asked for; width 0 keeps the native size."""
+
+    width:   int = 0
+    quality: int = settings.STREAM_JPEG_QUALITY
+
+    @property
+    def label(self) -> str:
+        return f"{self.width or 'native'}@q{self.quality}"
+
+    def encode(self, frame) -> Optional[bytes]:
+        h, w = frame.shape[:2]
+        if self.width and self.width < w:  # never upscale
+            size  = (self.width, max(1, round(h * self.width / w)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return buffer.tobytes() if ok else None
+
+
+class EncodeStats:
+    def __init__(self):
+        self.frames   = 0
+        self.total_ms = 0.0
+        self.max_ms   = 0.0
+
+    def record(self, ms: float) -> None:
+        self.frames   += 1
+        self.total_ms += ms
+        self.max_ms    = max(self.max_ms, ms)
+
+    def as_dict(self) -> dict:
+        return {
+            "frames":        self.frames,
+            "avg_encode_ms": round(self.total_ms / self.frames, 3) if self.frames else 0.0,
+            "max_encode_ms": round(self.max_ms, 3),
+        }
+
+
+class Subscriber:
+    """
+    One viewer's bounded frame buffer.
+
+    When the viewer falls behind, the oldest frame is dropped so the
+    producer never blocks on a slow client. `max_fps` > 0 thins the
+    stream for this viewer before anything is encoded for it.
+    """
+
+    events = False  # True for score/keypoint listeners, which get no video
+    queue_type = queue.Queue
+
+    def __init__(self, maxsize: int, rendition: Optional[Rendition] = None, max_fps: float = 0):
+        self._q        = self.queue_type(maxsize=maxsize)
+        self.dropped   = 0
+        self.rendition = rendition or Rendition()
+        self.interval  = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._next_at  = 0.0
+
+    def due(self, now: float) -> bool:
+        """Whether this viewer wants the frame produced at `now`."""
+        if now < self._next_at:
+            return False
+        # step from the previous slot so jitter doesn't lower the rate,
+        # but restart the schedule after a gap instead of bursting
+        on_schedule   = now - self._next_at < self.interval
+        self._next_at = (self._next_at if on_schedule else now) + self.interval
+        return True
+
+    def push(self, chunk: Optional[bytes]) -> None:
+        while True:
+            try:
+                self._q.put_nowait(chunk)
+                return
+            except queue.Full:
+                try:
+                    self._q.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        return self._q.get(timeout=timeout)
+
+
+class AsyncSubscriber(Subscriber):
+    """
+    Viewer served from the event loop: the producer thread hands frames
+    over with call_soon_threadsafe and only the newest one is kept, so a
+    response never waits on a thread and never falls behind.
+    """
+
+    queue_type = asyncio.Queue
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        rendition: Optional[Rendition] = None,
+        max_fps: float = 0,
+    ):
+        super().__init__(1, rendition, max_fps)
+        self._loop = loop
+
+    def push(self, chunk: Optional[bytes]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put_latest, chunk)
+        except RuntimeError:  # loop already closed
+            pass
+
+    def _put_latest(self, chunk: Optional[bytes]) -> None:
+        if self._q.full():
+            self._q.get_nowait()
+            self.dropped += 1
+        self._q.put_nowait(chunk)
+
+    async def get_async(self) -> Optional[bytes]:
+        return await self._q.get()
+
+
+class EventSubscriber(AsyncSubscriber):
+    """Listener for per-frame detector results (dicts) instead of JPEGs."""
+
+    events = True
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_rate: float = 0):
+        super().__init__(loop, max_fps=max_rate)
+        self.rendition = None
+
+
+class CameraBroadcaster:
+    """
+    Single capture + inference pipeline for one camera.
+
+    Each annotated frame is JPEG-encoded once per rendition requested by
+    the current viewers and the same bytes are fanned out to every
+    subscriber of that rendition. The pipeline starts with the first subscriber
+    and releases the camera when the last one leaves, unless it has been
+    pinned by the supervisor with start().
+    """
+
+    def __init__(
+        self,
+        camera_index: int,
+        detector_factory: Callable[[int], ViolenceDetector] = make_detector,
+        buffer_size: int = settings.STREAM_BUFFER_FRAMES,
+    ):
+        self.cam              = camera_index
+        self.detector_factory = detector_factory
+        self.buffer_size      = buffer_size
+
+        self._lock        = threading.Lock()
+        self._subscribers: Set[Subscriber] = set()
+        self._thread:  Optional[threading.Thread] = None
+        self._stop     = threading.Event()
+        self.pinned    = False
+        self.frames    = 0
+        self.restarts  = 0
+        self.last_frame_at = 0.0
+        self.detector: Optional[ViolenceDetector] = None
+        self.encode_stats: Dict[Rendition, EncodeStats] = {}
+        self.last_alert_at = float("-inf")
+        self.stages    = StageTimer(camera_index)
+        self.fps       = 0.0
+        self.dropped_frames = 0   # captured but replaced before the detector got to them
+        self._latest: Optional[queue.Queue] = None
+        self._last_tick: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _launch(self, after: Optional[threading.Thread] = None) -> None:
+        # caller holds self._lock; each run gets its own stop event so a
+        # stalled thread that is replaced can never publish again
+        self._stop = threading.Event()
+        self.last_frame_at = time.monotonic()
+        self.fps   = 0.0
+        self._last_tick = None
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop, after),
+            name=f"camera-{self.cam}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def start(self) -> None:
+        """Keep the pipeline running even with no viewers attached."""
+        with self._lock:
+            self.pinned = True
+            self._ensure_running()
+
+    def stop(self) -> None:
+        with self._lock:
+            self.pinned = False
+            self._stop.set()
+
+    def restart(self) -> None:
+        with self._lock:
+            self._stop.set()
+            self.restarts += 1
+            # a stalled reader may still hold the device; the new run
+            # waits for the old one before opening it
+            self._launch(after=self._thread)
+
+    def subscribe(self, sub: Optional[Subscriber] = None) -> Subscriber:
+        sub = sub or Subscriber(self.buffer_size)
+        with self._lock:
+            self._subscribers.add(sub)
+            self._ensure_running()
+        return sub
+
+    def _ensure_running(self) -> None:
+        # caller holds self._lock. A run that has been told to stop may
+        # still be finishing its last frame; it must not be reused (it
+        # would end the new viewer's stream), so start a fresh run that
+        # opens the camera once the old one has released it.
+        if not self.running:
+            self._launch()
+        elif self._stop.is_set():
+            self._launch(after=self._thread)
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+            if not self._subscribers and not self.pinned:
+                self._stop.set()
+
+    def stream(self, sub: Subscriber) -> Iterator[bytes]:
+        """MJPEG body for one viewer; always unsubscribes on exit."""
+        try:
+            while True:
+                try:
+                    chunk = sub.get(timeout=1.0)
+                except queue.Empty:
+                    if not self.running:
+                        break
+                    continue
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.unsubscribe(sub)
+
+    def subscribe_async(self, rendition: Optional[Rendition] = None, max_fps: float = 0) -> AsyncSubscriber:
+        return self.subscribe(AsyncSubscriber(asyncio.get_running_loop(), rendition, max_fps))
+
+    async def stream_async(self, sub: AsyncSubscriber) -> AsyncIterator[bytes]:
+        """
+        MJPEG body served straight from the event loop. When the client
+        disconnects the response task is cancelled, the viewer is dropped
+        and, if it was the last one, the pipeline stops and frees the camera.
+        """
+        try:
+            while True:
+                chunk = await sub.get_async()
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.unsubscribe(sub)
+
+    def subscribe_events(self, max_rate: float = 0) -> EventSubscriber:
+        return self.subscribe(EventSubscriber(asyncio.get_running_loop(), max_rate))
+
+    def status(self) -> dict:
+        with self._lock:
+            viewers = len(self._subscribers)
+        return {
+            "camera":          self.cam,
+            "running":         self.running,
+            "pinned":          self.pinned,
+            "viewers":         viewers,
+            "frames":          self.frames,
+            "restarts":        self.restarts,
+            "last_frame_age":  round(time.monotonic() - self.last_frame_at, 2),
+            "fps":             round(self.fps, 2),
+            "dropped_frames":  self.dropped_frames,
+            "quality":         self._quality(),
+            "gating":          self._gating(),
+            "renditions":      {r.label: st.as_dict() for r, st in list(self.encode_stats.items())},
+        }
+
+    def _quality(self) -> Optional[dict]:
+        governor = getattr(self.detector, "governor", None)
+        return governor.status() if governor is not None else None
+
+    def _gating(self) -> Optional[dict]:
+        gate = getattr(self.detector, "gate", None)
+        return gate.stats() if gate is not None else None
+
+    def _publish(self, chunk: Optional[bytes]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.push(chunk)
+
+    def _publish_frame(self, frame) -> None:
+        """Encode `frame` once per rendition that has a viewer due for it."""
+        now = time.monotonic()
+        with self._lock:
+            subscribers = list(self._subscribers)
+        viewers = [sub for sub in subscribers if not sub.events]
+        wanted: Dict[Rendition, List[Subscriber]] = {}
+        for sub in viewers:
+            if sub.due(now):
+                wanted.setdefault(sub.rendition, []).append(sub)
+        # keep stats only for renditions someone is watching; viewers pick
+        # any width/quality, so the dict would otherwise grow without bound
+        if len(self.encode_stats) > len(wanted):
+            active = {sub.rendition for sub in viewers}
+            for rendition in [r for r in self.encode_stats if r not in active]:
+                del self.encode_stats[rendition]
+        for rendition, subs in wanted.items():
+            start = time.perf_counter()
+            jpeg  = rendition.encode(frame)
+            elapsed = time.perf_counter() - start
+            self.stages.observe("encode", elapsed)
+            self.encode_stats.setdefault(rendition, EncodeStats()).record(elapsed * 1000)
+            if jpeg is None:
+                continue
+            chunk = mjpeg_chunk(jpeg)
+            for sub in subs:
+                sub.push(chunk)
+
+    def _publish_event(self, detector, score: Optional[float]) -> None:
+        """Send the latest detector result to every event listener due for it."""
+        now = time.monotonic()
+        with self._lock:
+            listeners = [sub for sub in self._subscribers if sub.events and sub.due(now)]
+        if not listeners:
+            return
+        event = {
+            "camera":   self.cam,
+            "frame":    self.frames,
+            "ts":       time.time(),
+            "score":    score,
+            "smoothed": getattr(detector, "smoothed", None),
+            "level":    getattr(detector, "level", None),
+            "poses":    getattr(detector, "poses", None),
+        }
+        for sub in listeners:
+            sub.push(event)
+
+    def _maybe_alert(self, detector, frame, score: Optional[float]) -> None:
+        """Queue an alert with the annotated frame while at/above ALERT_LEVEL, once per cooldown."""
+        if score is None:
+            return  # no fresh inference on this frame: the level may be stale
+        if not detector.trained:
+            return  # an untrained classifier's scores are noise, not alerts
+        levels = ("warning", "urgent")
+        level  = getattr(detector, "level", None)
+        if settings.ALERT_LEVEL not in levels or level not in levels:
+            return
+        if levels.index(level) < levels.index(settings.ALERT_LEVEL):
+            return
+        now = time.monotonic()
+        if now - self.last_alert_at < settings.ALERT_COOLDOWN_SECONDS:
+            return
+        ok, buffer = cv2.imencode(".jpg", frame)
+        if ok:
+            self.last_alert_at = now
+            alert_writer.enqueue(image=buffer.tobytes(), camera_id=self.cam, score=detector.smoothed)
+
+    def _open_capture(self):
+        cap = cv2.VideoCapture(self.cam, cv2.CAP_DSHOW)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH,  640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap.set(cv2.CAP_PROP_FPS,          15)
+        return cap
+
+    def _read_frames(self, cap, latest: queue.Queue, stop: threading.Event):
+        """Capture thread: keep only the newest frame for the processor."""
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                self.stages.observe("capture", time.perf_counter() - start)
+                if not ret:
+                    break
+                try:
+                    latest.get_nowait()
+                    self.dropped_frames += 1
+                except queue.Empty:
+                    pass
+                latest.put_nowait(frame)
+        finally:
+            cap.release()
+
+    def _run(self, stop: threading.Event, after: Optional[threading.Thread] = None):
+        if after is not None:
+            after.join(timeout=settings.CAMERA_STALL_SECONDS)
+        if stop.is_set():
+            self._finish(stop)
+            return
+        cap = self._open_capture()
+        if not cap.isOpened():
+            logger.warning("Camera %s could not be opened", self.cam)
+            cap.release()
+            self._finish(stop)
+            return
+
+        latest = self._latest = queue.Queue(maxsize=1)
+        reader = threading.Thread(
+            target=self._read_frames,
+            args=(cap, latest, stop),
+            name=f"camera-{self.cam}-capture",
+            daemon=True,
+        )
+        reader.start()
+        try:
+            detector = self.detector = self.detector_factory(self.cam)
+            while not stop.is_set():
+                try:
+                    frame = latest.get(timeout=1.0)
+                except queue.Empty:
+                    if not reader.is_alive():
+                        break
+                    continue
+                with scheduler.slot():
+                    out, score = detector.process_frame(frame)
+                if stop.is_set():
+                    continue
+                self.frames += 1
+                self._tick(time.monotonic())
+                self._publish_frame(out)
+                self._publish_event(detector, score)
+                self._maybe_alert(detector, out, score)
+        except Exception:
+            logger.exception("Camera %s pipeline crashed", self.cam)
+        finally:
+            stop.set()
+            # the camera is released by the reader; wait for it so a
+            # stopped pipeline never still holds the device
+            reader.join(timeout=settings.CAMERA_STALL_SECONDS)
+            self._finish(stop)
+
+    def _tick(self, now: float) -> None:
+        last, self._last_tick = self._last_tick, now
+        self.last_frame_at = now
+        interval = now - last if last is not None else 0.0
+        if interval > 0:
+            rate = 1.0 / interval
+            self.fps = rate if not self.fps else self.fps + FPS_SMOOTHING * (rate - self.fps)
+
+    def _finish(self, stop: threading.Event):
+        # wake every viewer so their responses end cleanly -- unless a
+        # restart already replaced this run
+        if stop is self._stop:
+            self._publish(None)
+
+
+_broadcasters: Dict[int, CameraBroadcaster] = {}
+_broadcasters_lock = threading.Lock()
+
+
+def get_broadcaster(camera_index: int) -> CameraBroadcaster:
+    with _broadcasters_lock:
+        if camera_index not in _broadcasters:
+            _broadcasters[camera_index] = CameraBroadcaster(camera_index)
+        return _broadcasters[camera_index]
+
+
+def all_broadcasters() -> Dict[int, CameraBroadcaster]:
+    with _broadcasters_lock:
+        return dict(_broadcasters)
+
+
+@metrics.collector
+def _camera_metrics():
+    cams = sorted(all_broadcasters().items())
+
+    def family(name, kind, help, value):
+        return name, kind, help, [("", {"camera": str(cam)}, value(b)) for cam, b in cams]
+
+    def depth(b):
+        latest = b._latest
+        return latest.qsize() if latest is not None and b.running else 0
+
+    return [
+        family("violence_camera_running", "gauge", "1 while the camera pipeline is running.",
+               lambda b: int(b.running)),
+        family("violence_camera_fps", "gauge", "Effective processed frames per second (smoothed).",
+               lambda b: round(b.fps, 3) if b.running else 0),
+        family("violence_camera_viewers", "gauge", "Connected stream and event subscribers.",
+               lambda b: len(b._subscribers)),
+        family("violence_frame_queue_depth", "gauge", "Captured frames waiting for the detector.",
+               depth),
+        ("violence_frames_processed_total", "counter", "Frames run through the detector.",
+         [("", {"camera": str(cam)}, b.frames) for cam, b in cams]),
+        ("violence_frames_dropped_total", "counter", "Captured frames replaced before the detector saw them.",
+         [("", {"camera": str(cam)}, b.dropped_frames) for cam, b in cams]),
+    ]
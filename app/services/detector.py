@@ -1,40 +1,58 @@
 import os
 import cv2
+import time
 import threading
 import queue
+import weakref
 import numpy as np
+from typing import Optional
 import tensorflow as tf
-import tensorflow_hub as hub
-from collections import deque
 from app.core.config import settings
+from app.services.model_registry import registry, weight_bytes
+from app.services.model_store import load_movenet
+from app.services.feature_store import FeatureStore
+from app.services.features import poses_to_features
+from app.services.extraction import ParallelExtractor
+from app.services.training import list_clips, prepare_clips, window_dataset
+from app.services.backends import (
+    TFPoseBackend, TFClassifierBackend, TFLitePoseBackend, TFLiteClassifierBackend,
+    selected_backend,
+)
+from app.services.window import SequenceWindow, ScoreSmoother
+from app.services.governor import QualityGovernor
+from app.services.gating import InferenceGate
+from app.services.metrics import StageTimer
 
 # --- POSE DETECTION ---
 class MoveNetMultiPose:
-    def __init__(self, model_url="https://tfhub.dev/google/movenet/multipose/lightning/1"):
-        self.model = hub.load(model_url)
+    def __init__(self, model_path=settings.MOVENET_PATH, backend=None):
+        if (backend or selected_backend()) == "tflite":
+            self.model   = None
+            self.backend = TFLitePoseBackend(settings.TFLITE_POSE_PATH)
+        else:
+            self.model   = load_movenet(model_path)
+            self.backend = TFPoseBackend(self.model)
         self.input_size = 256
 
-    @tf.function
-    def _infer(self, inp):
-        return self.model.signatures['serving_default'](inp)['output_0']
-
-    def detect(self, frame):
-        square = cv2.resize(frame, (self.input_size, self.input_size), interpolation=cv2.INTER_AREA)
-        rgb    = cv2.cvtColor(square, cv2.COLOR_BGR2RGB)
-        inp    = tf.cast(rgb, tf.int32)[tf.newaxis, ...]
-        poses  = self._infer(inp).numpy()[0]
-        return poses
-
-    def keypoints_to_features(self, poses, orig_size):
-        h, w = orig_size
-        feats = []
-        for p in poses:
-            kpts   = p[:51].reshape(17,3)
-            coords = []
-            for y,x,s in kpts:
-                coords += [0.0,0.0] if s < 0.2 else [x*w, y*h]
-            feats.extend(coords)
-        return np.array(feats, dtype=np.float32)
+    def preprocess(self, frame, input_size=None):
+        size   = input_size or self.input_size
+        square = cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(square, cv2.COLOR_BGR2RGB)
+
+    def detect(self, frame, input_size=None):
+        return self.backend(self.preprocess(frame, input_size))
+
+    def detect_rgb(self, rgb):
+        """MoveNet on an already preprocessed (square, RGB) image."""
+        return self.backend(rgb)
+
+    def keypoints_to_features(self, poses, orig_size, max_people=None, out=None):
+        return poses_to_features(poses, orig_size, max_people, out=out)
+
+    @property
+    def weight_bytes(self) -> int:
+        # the SavedModel holds the TF weights; the TFLite backend its flatbuffer
+        return weight_bytes(self.model if self.model is not None else self.backend)
 
 # --- TRANSFORMER BLOCK & MODEL ---
 class TransformerBlock(tf.keras.layers.Layer):
@@ -77,6 +95,17 @@ class ViolenceTransformer(tf.keras.Model):
         x = self.drop(self.fc(x), training=training)
         return self.out(x)
 
+def build_transformer(seq_len, feat_dim):
+    model = ViolenceTransformer(seq_len, feat_dim)
+    # warm‐up & compile
+    dummy = tf.zeros((1, seq_len, feat_dim))
+    model(dummy, training=False)
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'], jit_compile=True)
+    return model
+
+# classifier instances holding trained weights (loaded from disk or fitted here)
+_trained_models = weakref.WeakSet()
+
 # --- VIOLENCE DETECTOR CLASS ---
 class ViolenceDetector:
     def __init__(
@@ -94,48 +123,122 @@ class ViolenceDetector:
         self.warning_th = warning_th
         self.urgent_th  = urgent_th
         self.smooth_w   = smoothing_window
+        self.backend    = selected_backend()
 
-        self.pose = MoveNetMultiPose()
-        feat_dim = max_people * 17 * 2
-        self.model = ViolenceTransformer(seq_len, feat_dim)
-
-        # warm‐up & compile
-        dummy = tf.zeros((1, seq_len, feat_dim))
-        self.model(dummy, training=False)
-        self.model.compile('adam', 'binary_crossentropy', ['accuracy'], jit_compile=True)
+        # models are loaded lazily, once per process, and shared by every detector
+        self.feat_dim   = max_people * 17 * 2
+        self._model_key = ("transformer", seq_len, self.feat_dim)
 
         self.frame_q  = queue.Queue(maxsize=1)
-        self.seq_buf  = deque(maxlen=seq_len)
-        self.pred_buf = deque(maxlen=smoothing_window)
+        self.window   = SequenceWindow(seq_len, self.feat_dim)
+        self.smoother = ScoreSmoother(
+            smoothing_window, settings.SMOOTHING_MODE, settings.SMOOTHING_ALPHA
+        )
+        self.governor  = QualityGovernor()
+        self.gate      = InferenceGate()
+        self.stages    = StageTimer(camera_index)
+        self._frame_no = 0
+        self._label    = ("Gathering…", (0, 255, 255))
+        # latest result, for event subscribers
+        self.level     = "gathering"
+        self.smoothed: Optional[float] = None
+        self.poses:    Optional[np.ndarray] = None
+
+    @property
+    def pose(self):
+        return registry.get(("movenet", self.backend), MoveNetMultiPose)
+
+    @property
+    def model(self):
+        return registry.get(
+            self._model_key,
+            lambda: build_transformer(self.seq_len, self.feat_dim),
+        )
+
+    @model.setter
+    def model(self, model):
+        registry.put(self._model_key, model)
+
+    @property
+    def trained(self) -> bool:
+        """
+        Whether the shared classifier has trained weights; until then
+        `model` is a randomly initialised transformer and its scores are
+        noise. TFLite classifiers are always converted from a trained one.
+        """
+        return self.backend == "tflite" or registry.peek(self._model_key) in _trained_models
+
+    def load_model(self, model_path: str) -> bool:
+        """Load the saved classifier into the shared registry; False if none is saved."""
+        if not os.path.exists(model_path):
+            return False
+        print(f"[INFO] Loading model from {model_path}")
+        start = time.perf_counter()
+        model = tf.keras.models.load_model(model_path)
+        registry.put(self._model_key, model, time.perf_counter() - start)
+        _trained_models.add(model)
+        return True
 
     def train_or_load(self, normal_dir: str, violent_dir: str, model_path: str):
-        if os.path.exists(model_path):
-            print(f"[INFO] Loading model from {model_path}")
-            self.model = tf.keras.models.load_model(model_path)
+        if self.trained or self.load_model(model_path):
             return
 
         print("[INFO] No model found → training now.")
-        X, y = [], []
-        for fn, label, folder in [*[(fn, 0, normal_dir) for fn in os.listdir(normal_dir)], *[(fn, 1, violent_dir) for fn in os.listdir(violent_dir)]]:
-            img = cv2.imread(os.path.join(folder, fn))
-            if img is None:
-                continue
-            poses = self.pose.detect(img)
-            feats = self.pose.keypoints_to_features(poses[:self.max_people], img.shape[:2])
-            X.append(feats)
-            y.append(label)
-
-        X = np.array(X).reshape(-1, self.seq_len, X[0].shape[0])
-        y = np.array(y)
-        print(f"[INFO] Dataset loaded: {X.shape[0]} samples")
-
-        self.model.fit(X, y, epochs=10, batch_size=16)
+        if self._train_on_clips(normal_dir, violent_dir):
+            clips = prepare_clips(
+                self.pose, list_clips(normal_dir, violent_dir), self.max_people
+            )
+            print(f"[INFO] Dataset loaded: {len(clips)} clips")
+            dataset = window_dataset(clips, self.seq_len, self.feat_dim, batch_size=16)
+            self.model.fit(dataset, epochs=10)
+        else:
+            X, y = self.extract_dataset(normal_dir, violent_dir)
+            X = X.reshape(-1, self.seq_len, self.feat_dim)
+            print(f"[INFO] Dataset loaded: {X.shape[0]} samples")
+            self.model.fit(X, y, epochs=10, batch_size=16)
+
         self.model.save(model_path)
+        _trained_models.add(self.model)
         print(f"[INFO] Model trained & saved to {model_path}")
 
-    @tf.function
+    def _train_on_clips(self, normal_dir: str, violent_dir: str) -> bool:
+        mode = settings.TRAIN_MODE.lower()
+        if mode == "auto":
+            return bool(list_clips(normal_dir, violent_dir))
+        return mode == "clips"
+
+    def extract_dataset(self, normal_dir: str, violent_dir: str):
+        """
+        Pose features + labels for every image in the two folders.
+        Features come from the on-disk FeatureStore; only new or changed
+        images are decoded and run through MoveNet, in parallel.
+        X is a memory map when possible.
+        """
+        store = FeatureStore(settings.FEATURES_PATH, self.feat_dim)
+        items = [
+            *[(os.path.join(normal_dir, fn), 0) for fn in sorted(os.listdir(normal_dir))],
+            *[(os.path.join(violent_dir, fn), 1) for fn in sorted(os.listdir(violent_dir))],
+        ]
+        rows, stats = ParallelExtractor(self.pose, self.max_people).run(
+            [path for path, _ in items], store
+        )
+        print(
+            f"[INFO] Features: {stats.cached} cached, {stats.extracted} extracted, "
+            f"{stats.failed} unreadable ({stats.images_per_sec:.1f} img/s)"
+        )
+        kept = [(row, label) for row, (_, label) in zip(rows, items) if row is not None]
+        return store.take([r for r, _ in kept]), np.array([l for _, l in kept])
+
+    @property
+    def classifier(self):
+        if self.backend == "tflite":
+            path = settings.TFLITE_CLASSIFIER_PATH
+            return registry.get(("transformer-tflite", path), lambda: TFLiteClassifierBackend(path))
+        return TFClassifierBackend(self.model)
+
     def _infer(self, seq):
-        return self.model(seq, training=False)
+        """(1, seq_len, feat_dim) float32 window → violence score."""
+        return self.classifier(seq)
 
     def _capture(self):
         cap = cv2.VideoCapture(self.cam, cv2.CAP_DSHOW)
@@ -150,31 +253,69 @@ class ViolenceDetector:
                 self.frame_q.put(frame)
         cap.release()
 
+    def process_frame(self, frame):
+        """
+        Run pose + transformer on one frame and return (annotated_frame, score).
+        score is None while the sequence buffer is still filling and on
+        frames the quality governor or motion gate skips (the last label
+        is reused).
+        """
+        start = time.perf_counter()
+        score = None
+        if self.governor.should_infer(self._frame_no) and self.gate.motion(frame):
+            score = self._infer_frame(frame)
+        self._frame_no += 1
+
+        overlay_at = time.perf_counter()
+        label, color = self._label
+        out = frame.copy()
+        cv2.putText(out, label, (10,30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
+        end = time.perf_counter()
+        self.stages.observe("overlay", end - overlay_at)
+        self.stages.observe("frame", end - start)
+        self.governor.record(end - start)
+        return out, score
+
+    def _infer_frame(self, frame):
+        h, w = frame.shape[:2]
+        t0 = time.perf_counter()
+        poses = self.poses = self.pose.detect(frame, self.governor.input_size)
+        t1 = time.perf_counter()
+        # features land directly in the window's next row
+        feat = self.pose.keypoints_to_features(
+            poses, (h, w), self.max_people, out=self.window.slot
+        )
+        self.window.advance()
+        t2 = time.perf_counter()
+        self.stages.observe("pose", t1 - t0)
+        self.stages.observe("features", t2 - t1)
+        if not self.window.full:
+            return None
+
+        if self.gate.present(feat):
+            score = self._infer(self.window.view())
+            self.stages.observe("inference", time.perf_counter() - t2)
+        else:
+            score = 0.0  # nobody in view: skip the transformer
+        avg   = self.smoothed = self.smoother.update(score)
+
+        if avg >= self.urgent_th:
+            self.level  = "urgent"
+            self._label = (f"🚨 URGENT VIOLENCE ({avg:.2f})", (0,0,255))
+        elif avg >= self.warning_th:
+            self.level  = "warning"
+            self._label = (f"⚠️ Warning ({avg:.2f})", (0,165,255))
+        else:
+            self.level  = "normal"
+            self._label = (f"✔ Normal ({avg:.2f})", (0,255,0))
+        return score
+
     def _process(self):
         while True:
             frame = self.frame_q.get()
-            h, w = frame.shape[:2]
-            poses = self.pose.detect(frame)
-            feat  = self.pose.keypoints_to_features(poses[:self.max_people], (h, w))
-            self.seq_buf.append(feat)
-
-            label, color = "Gathering…", (0, 255, 255)
-            if len(self.seq_buf) == self.seq_len:
-                arr   = np.stack(self.seq_buf, axis=0)[None, ...]
-                score = float(self._infer(tf.constant(arr))[0,0].numpy())
+            out, score = self.process_frame(frame)
+            if score is not None:
                 print(f"[DEBUG] Frame score: {score:.4f}")
-                self.pred_buf.append(score)
-                avg   = np.mean(self.pred_buf)
-
-                if avg >= self.urgent_th:
-                    label, color = f"🚨 URGENT VIOLENCE ({avg:.2f})", (0,0,255)
-                elif avg >= self.warning_th:
-                    label, color = f"⚠️ Warning ({avg:.2f})", (0,165,255)
-                else:
-                    label, color = f"✔ Normal ({avg:.2f})", (0,255,0)
-
-            out = frame.copy()
-            cv2.putText(out, label, (10,30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
             cv2.imshow(f"Camera {self.cam} Detection", out)
             if cv2.waitKey(1) & 0xFF == 27:
                 break
@@ -0,0 +1,141 @@
+# app/services/extraction.py
+
+import os
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.services.feature_store import FeatureStore
+from app.services.features import poses_to_features
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractionStats:
+    total:     int = 0
+    cached:    int = 0
+    extracted: int = 0
+    failed:    int = 0
+    seconds:   float = 0.0
+
+    @property
+    def images_per_sec(self) -> float:
+        return self.extracted / self.seconds if self.seconds else 0.0
+
+
+def bounded_map(
+    pool: ThreadPoolExecutor, fn: Callable, items: Iterable, max_pending: int
+) -> Iterator:
+    """Executor.map that keeps at most `max_pending` tasks in flight, in order."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ParallelExtractor:
+    """
+    Dataset → pose features with every core busy.
+
+    Stage 1 (decode pool): cv2.imread + resize + BGR→RGB, which release
+    the GIL. Stage 2 (pose pool): MoveNet over a micro-batch of decoded
+    images, then one vectorised feature conversion for the whole batch.
+    MoveNet MultiPose only accepts one image per call, so batching
+    amortises everything around it and pose workers overlap the calls.
+    """
+
+    def __init__(
+        self,
+        pose,
+        max_people: int,
+        decode_workers: int = settings.EXTRACT_DECODE_WORKERS,
+        pose_workers: int = settings.EXTRACT_POSE_WORKERS,
+        batch_size: int = settings.EXTRACT_BATCH_SIZE,
+        report_every: float = 5.0,
+    ):
+        self.pose           = pose
+        self.max_people     = max_people
+        self.decode_workers = decode_workers or os.cpu_count() or 1
+        self.pose_workers   = max(pose_workers, 1)
+        self.batch_size     = max(batch_size, 1)
+        self.report_every   = report_every
+
+    def _decode(self, path: str) -> Tuple[str, Optional[np.ndarray], Tuple[int, int]]:
+        img = cv2.imread(path)
+        if img is None:
+            return path, None, (0, 0)
+        return path, self.pose.preprocess(img), img.shape[:2]
+
+    def _pose_batch(self, batch: List[tuple]) -> List[Tuple[str, Optional[np.ndarray]]]:
+        ok = [(path, rgb, size) for path, rgb, size in batch if rgb is not None]
+        out = [(path, None) for path, rgb, _ in batch if rgb is None]
+        if ok:
+            poses = np.stack([self.pose.detect_rgb(rgb) for _, rgb, _ in ok])
+            sizes = np.array([size for _, _, size in ok])
+            feats = poses_to_features(poses, sizes, self.max_people)
+            out  += [(path, f) for (path, _, _), f in zip(ok, feats)]
+        return out
+
+    def run(self, paths: Sequence[str], store: FeatureStore) -> Tuple[List[Optional[int]], ExtractionStats]:
+        """Store row per path (None if unreadable), extracting only cache misses."""
+        stats = ExtractionStats(total=len(paths))
+        rows: dict = {}
+        misses = []
+        for path in paths:
+            row = store.lookup(path)
+            if row is None:
+                misses.append(path)
+            else:
+                rows[path] = row
+        stats.cached = len(rows)
+
+        start = last_report = time.perf_counter()
+        with ThreadPoolExecutor(self.decode_workers, thread_name_prefix="decode") as decode_pool, \
+             ThreadPoolExecutor(self.pose_workers, thread_name_prefix="pose") as pose_pool:
+            decoded = bounded_map(
+                decode_pool, self._decode, misses, self.batch_size * self.pose_workers * 2
+            )
+            results = bounded_map(
+                pose_pool, self._pose_batch, batched(decoded, self.batch_size), self.pose_workers * 2
+            )
+            for batch in results:
+                for path, feats in batch:
+                    if feats is None:
+                        stats.failed += 1
+                        continue
+                    rows[path] = store.add(path, feats)
+                    stats.extracted += 1
+
+                now = time.perf_counter()
+                if now - last_report >= self.report_every:
+                    last_report = now
+                    done = stats.extracted + stats.failed
+                    logger.info(
+                        "Extracted %d/%d images (%.1f img/s)",
+                        done, len(misses), stats.extracted / (now - start),
+                    )
+        store.flush()
+        stats.seconds = time.perf_counter() - start
+        return [rows.get(path) for path in paths], stats
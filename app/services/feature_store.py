@@ -0,0 +1,128 @@
+# app/services/feature_store.py
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureStore:
+    """
+    On-disk cache of pose features for training images.
+
+    Rows live in a flat float32 file that is read back as a memory map;
+    a JSON index maps each image path to its row, keyed by the file's
+    content hash. Size + mtime are checked first so unchanged files are
+    never re-read; a changed file is re-hashed and re-extracted only if
+    its contents actually differ.
+    """
+
+    FLUSH_EVERY = 1000
+
+    def __init__(self, root: str = settings.FEATURES_PATH, feat_dim: int = 68):
+        self.root     = root
+        self.feat_dim = feat_dim
+        # one file pair per feature width (i.e. per MAX_PEOPLE)
+        self.data_path  = os.path.join(root, f"features-{feat_dim}.f32")
+        self.index_path = os.path.join(root, f"index-{feat_dim}.json")
+
+        os.makedirs(root, exist_ok=True)
+        self._lock  = threading.Lock()
+        self._dirty = 0
+        self.index: Dict[str, dict] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as fh:
+                self.index = json.load(fh)
+        self.rows = self._rows_on_disk()
+        # rows written after the last flush are unreferenced; drop them
+        self.rows = min(self.rows, 1 + max((e["row"] for e in self.index.values()), default=-1))
+        self._truncate(self.rows)
+
+        self.hits   = 0
+        self.misses = 0
+
+    def _rows_on_disk(self) -> int:
+        if not os.path.exists(self.data_path):
+            return 0
+        return os.path.getsize(self.data_path) // (4 * self.feat_dim)
+
+    def _truncate(self, rows: int) -> None:
+        if os.path.exists(self.data_path):
+            with open(self.data_path, "r+b") as fh:
+                fh.truncate(rows * 4 * self.feat_dim)
+
+    def lookup(self, path: str) -> Optional[int]:
+        """Row for `path` if its cached features are still valid."""
+        entry = self.index.get(path)
+        if entry is None:
+            self.misses += 1
+            return None
+        st = os.stat(path)
+        if (st.st_size, st.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+            if file_digest(path) != entry["sha256"]:
+                self.misses += 1
+                return None
+            with self._lock:
+                entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+                self._dirty += 1
+        self.hits += 1
+        return entry["row"]
+
+    def add(self, path: str, features: np.ndarray) -> int:
+        feats = np.ascontiguousarray(features, dtype=np.float32).reshape(self.feat_dim)
+        st = os.stat(path)
+        entry = {
+            "sha256":   file_digest(path),
+            "size":     st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        with self._lock:
+            with open(self.data_path, "ab") as fh:
+                fh.write(feats.tobytes())
+            entry["row"] = self.rows
+            self.rows += 1
+            self.index[path] = entry
+            self._dirty += 1
+            if self._dirty >= self.FLUSH_EVERY:
+                self._flush_locked()
+        return entry["row"]
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(self.index, fh)
+        os.replace(tmp, self.index_path)
+        self._dirty = 0
+
+    def matrix(self) -> np.ndarray:
+        """All cached rows as a read-only (rows, feat_dim) memory map."""
+        if self.rows == 0:
+            return np.empty((0, self.feat_dim), dtype=np.float32)
+        return np.memmap(
+            self.data_path, dtype=np.float32, mode="r", shape=(self.rows, self.feat_dim)
+        )
+
+    def take(self, rows) -> np.ndarray:
+        """Rows in order; a memory-map slice (no copy) when they are contiguous."""
+        rows = np.asarray(rows, dtype=np.int64)
+        mat  = self.matrix()
+        if len(rows) and np.array_equal(rows, np.arange(rows[0], rows[0] + len(rows))):
+            return mat[rows[0]:rows[0] + len(rows)]
+        return mat[rows]
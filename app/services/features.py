@@ -0,0 +1,48 @@
+# app/services/features.py
+
+import numpy as np
+
+NUM_KEYPOINTS = 17
+KEYPOINT_TH   = 0.2
+POSE_SCORE    = 55  # index of the per-person score in MoveNet's 56-wide rows
+
+def poses_to_features(poses, orig_size, max_people=None, out=None, score_th=KEYPOINT_TH):
+    """
+    Vectorised MoveNet → feature conversion.
+
+    poses:     (N, 56) for one frame or (B, N, 56) for a batch of frames.
+    orig_size: (h, w) shared by the batch, or a (B, 2) array of sizes.
+    Keeps the `max_people` highest-scoring persons, scales keypoints to
+    pixels and zeroes those below `score_th`. Writes into `out` (shape
+    (max_people*34,) or (B, max_people*34)) when given; missing persons
+    are zero-filled.
+    """
+    poses  = np.asarray(poses, dtype=np.float32)
+    single = poses.ndim == 2
+    if single:
+        poses = poses[np.newaxis]
+    batch, n_people = poses.shape[:2]
+    max_people = n_people if max_people is None else max_people
+    keep       = min(max_people, n_people)
+
+    if out is None:
+        out = np.zeros((batch, max_people * NUM_KEYPOINTS * 2), dtype=np.float32)
+    view = out.reshape(batch, max_people, NUM_KEYPOINTS, 2)
+    view[:, keep:] = 0.0
+
+    # top-`keep` persons by score, highest first
+    order = np.argsort(-poses[:, :, POSE_SCORE], axis=1, kind="stable")[:, :keep]
+    top   = poses[np.arange(batch)[:, np.newaxis], order]
+    kpts  = top[:, :, :NUM_KEYPOINTS * 3].reshape(batch, keep, NUM_KEYPOINTS, 3)
+
+    # (x, y) → (x*w, y*h), zeroed where the keypoint score is too low
+    if np.ndim(orig_size) == 1:
+        h, w = orig_size
+        scale = np.array((w, h), dtype=np.float32)
+    else:
+        scale = np.asarray(orig_size, dtype=np.float32)[:, ::-1].reshape(batch, 1, 1, 2)
+    valid = kpts[..., 2:3] >= score_th
+    np.multiply(kpts[..., 1::-1], scale, out=view[:, :keep])
+    np.multiply(view[:, :keep], valid, out=view[:, :keep])
+
+    return out[0] if single and out.ndim == 2 else out
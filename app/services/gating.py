@@ -0,0 +1,90 @@
+# app/services/gating.py
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+
+class InferenceGate:
+    """
+    Cheap checks in front of the expensive models.
+
+    motion():  frame differencing on a small grayscale copy of the frame;
+               when nothing moved, MoveNet is skipped. Inference keeps
+               running for `keepalive` checks after the last motion so a
+               still-but-present scene is still scored, and once gated
+               every `refresh`-th check still runs so the label and
+               level can't stay frozen at their pre-idle values.
+    present(): after MoveNet, whether any keypoint passed the confidence
+               threshold; when none did, the transformer is skipped.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.MOTION_GATE_ENABLED,
+        width: int = settings.MOTION_WIDTH,
+        pixel_threshold: int = settings.MOTION_PIXEL_THRESHOLD,
+        min_area: float = settings.MOTION_MIN_AREA,
+        keepalive: int = settings.MOTION_KEEPALIVE,
+        refresh: int = settings.MOTION_REFRESH,
+    ):
+        self.enabled         = enabled
+        self.width           = width
+        self.pixel_threshold = pixel_threshold
+        self.min_area        = min_area
+        self.keepalive       = keepalive
+        self.refresh         = refresh
+
+        self._prev: np.ndarray = None
+        self._idle = keepalive  # stay open until there is a reference frame
+
+        self.checked        = 0
+        self.motion_skips   = 0
+        self.presence_checks = 0
+        self.presence_skips = 0
+
+    def motion(self, frame: np.ndarray) -> bool:
+        self.checked += 1
+        if not self.enabled:
+            return True
+
+        h, w  = frame.shape[:2]
+        small = cv2.resize(
+            frame, (self.width, max(1, h * self.width // w)), interpolation=cv2.INTER_AREA
+        )
+        gray  = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        prev, self._prev = self._prev, gray
+
+        if prev is None or prev.shape != gray.shape:
+            moved = True
+        else:
+            diff  = cv2.absdiff(gray, prev)
+            moved = np.count_nonzero(diff > self.pixel_threshold) >= self.min_area * diff.size
+
+        self._idle = 0 if moved else self._idle + 1
+        gated = self._idle - self.keepalive
+        if gated > 0 and not (self.refresh and gated % self.refresh == 0):
+            self.motion_skips += 1
+            return False
+        return True
+
+    def present(self, features: np.ndarray) -> bool:
+        # low-confidence keypoints are zeroed by the feature extractor
+        self.presence_checks += 1
+        if features.any():
+            return True
+        self.presence_skips += 1
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "checked":            self.checked,
+            "motion_skips":       self.motion_skips,
+            "motion_skip_ratio":  round(self.motion_skips / self.checked, 4) if self.checked else 0.0,
+            "presence_skips":     self.presence_skips,
+            "presence_skip_ratio": (
+                round(self.presence_skips / self.presence_checks, 4)
+                if self.presence_checks else 0.0
+            ),
+        }
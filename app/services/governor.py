@@ -0,0 +1,105 @@
+# app/services/governor.py
+
+from typing import List, Tuple
+
+from app.core.config import settings
+
+# MoveNet MultiPose wants input sides that are multiples of 32
+INPUT_STEP = 32
+
+
+def build_levels(
+    min_size: int, max_size: int, min_stride: int, max_stride: int
+) -> List[Tuple[int, int]]:
+    """
+    Quality ladder of (stride, input_size), best first.
+
+    Each step down alternates between a smaller MoveNet input and running
+    inference on fewer frames, until both floors are reached.
+    """
+    stride = max(min_stride, 1)
+    size   = max_size - max_size % INPUT_STEP
+    floor  = max(min_size - min_size % INPUT_STEP, INPUT_STEP)
+    levels = [(stride, size)]
+    shrink = True
+    while stride < max_stride or size > floor:
+        if (shrink and size > floor) or stride >= max_stride:
+            size -= INPUT_STEP
+        else:
+            stride += 1
+        shrink = not shrink
+        levels.append((stride, size))
+    return levels
+
+
+class QualityGovernor:
+    """
+    Keeps per-frame processing time within a budget.
+
+    Tracks an EMA of the time spent per frame (skipped frames included);
+    above the budget it steps down the quality ladder, well below it it
+    steps back up. A cooldown lets the EMA settle between changes.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = settings.FRAME_BUDGET_MS,
+        min_size: int = settings.POSE_INPUT_MIN,
+        max_size: int = settings.POSE_INPUT_MAX,
+        min_stride: int = settings.INFERENCE_STRIDE_MIN,
+        max_stride: int = settings.INFERENCE_STRIDE_MAX,
+        enabled: bool = settings.GOVERNOR_ENABLED,
+        upgrade_ratio: float = 0.6,
+        cooldown: int = 30,
+        alpha: float = 0.1,
+    ):
+        self.budget        = budget_ms / 1000.0
+        self.levels        = build_levels(min_size, max_size, min_stride, max_stride)
+        self.enabled       = enabled
+        self.upgrade_ratio = upgrade_ratio
+        self.cooldown      = cooldown
+        self.alpha         = alpha
+
+        self.level    = 0
+        self.avg      = 0.0
+        self.frames   = 0
+        self._settle  = cooldown
+
+    @property
+    def stride(self) -> int:
+        return self.levels[self.level][0]
+
+    @property
+    def input_size(self) -> int:
+        return self.levels[self.level][1]
+
+    def should_infer(self, frame_no: int) -> bool:
+        return frame_no % self.stride == 0
+
+    def record(self, seconds: float) -> None:
+        self.frames += 1
+        self.avg = seconds if self.frames == 1 else self.avg + self.alpha * (seconds - self.avg)
+        if not self.enabled:
+            return
+        if self._settle > 0:
+            self._settle -= 1
+            return
+
+        if self.avg > self.budget and self.level < len(self.levels) - 1:
+            self._set_level(self.level + 1)
+        elif self.avg < self.budget * self.upgrade_ratio and self.level > 0:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level: int) -> None:
+        self.level   = level
+        self._settle = self.cooldown
+
+    def status(self) -> dict:
+        return {
+            "level":       self.level,
+            "max_level":   len(self.levels) - 1,
+            "stride":      self.stride,
+            "input_size":  self.input_size,
+            "avg_ms":      round(self.avg * 1000, 2),
+            "budget_ms":   round(self.budget * 1000, 2),
+        }
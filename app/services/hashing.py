@@ -0,0 +1,112 @@
+# app/services/hashing.py
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+
+def make_context(
+    time_cost: int = settings.ARGON2_TIME_COST,
+    memory_cost: int = settings.ARGON2_MEMORY_COST,
+    parallelism: int = settings.ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    Argon2 context with cost parameters from Settings. Hashes made with
+    other parameters still verify, but needs_update() flags them so they
+    are re-hashed on the next successful login.
+    """
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+class HashingOverloaded(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, retry shortly",
+            headers={"Retry-After": str(settings.HASH_RETRY_AFTER)},
+        )
+
+
+class HashExecutor:
+    """
+    Dedicated, bounded pool for password hashing and verification.
+
+    Argon2 is deliberately slow and memory hungry; running it on the
+    shared threadpool lets a login burst starve every other endpoint.
+    Here at most `workers` hashes run at once and `queue_size` more may
+    wait; anything beyond that is rejected straight away with a 503
+    instead of piling up.
+    """
+
+    def __init__(self, workers: int = settings.HASH_WORKERS, queue_size: int = settings.HASH_QUEUE_MAX):
+        self.workers    = max(workers, 1)
+        self.queue_size = max(queue_size, 0)
+        self._pool      = ThreadPoolExecutor(self.workers, thread_name_prefix="hash")
+        self._admit     = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock      = threading.Lock()
+        self.pending    = 0
+        self.completed  = 0
+        self.rejected   = 0
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._admit.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingOverloaded()
+        with self._lock:
+            self.pending += 1
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future: Future) -> None:
+        with self._lock:
+            self.pending   -= 1
+            self.completed += 1
+        self._admit.release()
+
+    async def run(self, fn: Callable, *args):
+        """Await `fn(*args)` on the pool (for async endpoints)."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def call(self, fn: Callable, *args):
+        """Run `fn(*args)` on the pool and wait (for sync endpoints)."""
+        return self.submit(fn, *args).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers":    self.workers,
+                "queue_size": self.queue_size,
+                "pending":    self.pending,
+                "completed":  self.completed,
+                "rejected":   self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+pwd_context = make_context()
+hasher      = HashExecutor()
+
+
+async def hash_password_async(password: str) -> str:
+    return await hasher.run(pwd_context.hash, password)
+
+
+async def verify_and_update_async(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash): new_hash is set when the stored hash used outdated parameters."""
+    return await hasher.run(pwd_context.verify_and_update, password, password_hash)
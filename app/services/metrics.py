@@ -0,0 +1,239 @@
+# app/services/metrics.py
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# seconds; per-stage work ranges from ~10µs (features) to ~100ms+ (pose on CPU)
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+HTTP_BUCKETS  = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]   # (suffix, labels, value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name       = name
+        self.help       = help
+        self.labelnames = tuple(labelnames)
+        self._lock      = threading.Lock()
+        self._children: Dict[Labels, object] = {}
+
+    def labels(self, *values) -> object:
+        """Child series for these label values; keep the handle on hot paths."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> object:
+        """A fresh series for one combination of label values."""
+
+    def samples(self) -> Iterable[Sample]:
+        for key, child in list(self._children.items()):
+            yield from child.samples(dict(zip(self.labelnames, key)))
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def samples(self, labels):
+        yield "", labels, self.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock   = threading.Lock()
+        self.buckets = buckets
+        self.counts  = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum     = 0.0
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum       += value
+
+    def samples(self, labels):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            yield "_bucket", {**labels, "le": _fmt(bound)}, cumulative
+        yield "_sum", labels, total
+        yield "_count", labels, cumulative
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets=STAGE_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus text-format registry (exposition format 0.0.4).
+
+    Counters and histograms are updated in place by the code that owns
+    them. Everything that is already tracked elsewhere (FPS, queue depth,
+    alert writer counters, ...) is read by collectors only when /metrics
+    is scraped, so it costs the hot loop nothing.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets=STAGE_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def collector(self, fn: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]):
+        """
+        Register `fn() -> [(name, type, help, [(suffix, labels, value), ...])]`,
+        called on every scrape. Usable as a decorator.
+        """
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        families = [(m.name, m.kind, m.help, list(m.samples())) for m in self._metrics]
+        for collect in self._collectors:
+            families.extend(collect())
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_labels(labels)} {_fmt(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "violence_stage_seconds",
+    "Time spent in each live pipeline stage, per camera.",
+    ("camera", "stage"),
+)
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers were sent (streams are not timed to the end).",
+    ("method", "route"),
+    HTTP_BUCKETS,
+)
+
+
+class StageTimer:
+    """
+    One camera's handles on violence_stage_seconds: the label lookup is
+    done once per stage, so observe() is a bisect and two adds.
+    """
+
+    def __init__(self, camera):
+        self.camera = "none" if camera is None else str(camera)
+        self._children: Dict[str, _HistogramChild] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        child = self._children.get(stage)
+        if child is None:
+            child = self._children[stage] = STAGE_SECONDS.labels(self.camera, stage)
+        child.observe(seconds)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting HTTP requests. Unlike BaseHTTPMiddleware
+    it passes the response through untouched (it only peeks at the
+    status), so MJPEG streams and their disconnect handling still work.
+    Routes are labelled by template (/alerts/{id}, not /alerts/42) to
+    keep the series count bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start  = time.perf_counter()
+        status: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                self._record(scope, status, time.perf_counter() - start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status is None:
+                self._record(scope, 500, time.perf_counter() - start)
+
+    @staticmethod
+    def _record(scope, status: int, seconds: float) -> None:
+        route = scope.get("route")
+        path  = getattr(route, "path", None) or scope.get("root_path") or "unmatched"
+        HTTP_REQUESTS.labels(scope["method"], path, status).inc()
+        HTTP_LATENCY.labels(scope["method"], path).observe(seconds)
@@ -0,0 +1,105 @@
+# app/services/model_registry.py
+
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Hashable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelStats:
+    key:          str
+    load_seconds: float
+    weight_bytes: int
+    loaded_at:    float
+
+
+def weight_bytes(model: Any) -> int:
+    """Sum of the variable sizes a model holds (0 if it exposes none)."""
+    if isinstance(getattr(model, "weight_bytes", None), int):
+        return model.weight_bytes
+    total = 0
+    for v in getattr(model, "variables", None) or ():
+        try:
+            # tf.Variable exposes a tf.DType, Keras 3 variables a dtype string
+            dtype = getattr(v.dtype, "as_numpy_dtype", v.dtype)
+            total += math.prod(int(d) for d in v.shape) * np.dtype(dtype).itemsize
+        except (TypeError, ValueError):
+            continue
+    return total
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+
+    Each model is loaded at most once (per key) and shared by every caller;
+    load time and weight memory are recorded for reporting.
+    """
+
+    def __init__(self):
+        self._lock   = threading.Lock()
+        self._models: Dict[Hashable, Any] = {}
+        self._stats:  Dict[Hashable, ModelStats] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        # one lock per key so a slow load doesn't block unrelated models
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                start = time.perf_counter()
+                model = loader()
+                self._record(key, model, time.perf_counter() - start)
+        return model
+
+    def put(self, key: Hashable, model: Any, load_seconds: float = 0.0) -> None:
+        """Replace the shared instance (e.g. after training or loading weights)."""
+        self._record(key, model, load_seconds)
+
+    def _record(self, key, model, seconds):
+        stats = ModelStats(
+            key=str(key),
+            load_seconds=round(seconds, 4),
+            weight_bytes=weight_bytes(model),
+            loaded_at=time.time(),
+        )
+        with self._lock:
+            self._models[key] = model
+            self._stats[key]  = stats
+        logger.info(
+            "Model %s ready in %.2fs (%.1f MB weights)",
+            stats.key, seconds, stats.weight_bytes / 1e6,
+        )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._models
+
+    def peek(self, key: Hashable) -> Any:
+        """The shared instance for `key`, or None; never loads it."""
+        return self._models.get(key)
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [asdict(s) for s in self._stats.values()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+            self._key_locks.clear()
+
+
+registry = ModelRegistry()
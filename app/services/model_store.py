@@ -0,0 +1,105 @@
+# app/services/model_store.py
+
+import os
+import time
+import shutil
+import hashlib
+import logging
+from typing import Optional
+
+import tensorflow as tf
+import tensorflow_hub as hub
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_FILE = "checksum.sha256"
+
+
+class ModelStoreError(RuntimeError):
+    pass
+
+
+def directory_digest(path: str) -> str:
+    """SHA-256 over every file of a SavedModel directory (names + contents)."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name == CHECKSUM_FILE:
+                continue
+            full = os.path.join(root, name)
+            rel  = os.path.relpath(full, path).replace(os.sep, "/")
+            digest.update(rel.encode() + b"\0")
+            with open(full, "rb") as fh:
+                for block in iter(lambda: fh.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def expected_digest(path: str, expected: Optional[str] = None) -> Optional[str]:
+    if expected:
+        return expected.strip().lower()
+    manifest = os.path.join(path, CHECKSUM_FILE)
+    if os.path.exists(manifest):
+        with open(manifest) as fh:
+            return fh.read().split()[0].lower()
+    return None
+
+
+def verify(path: str, expected: Optional[str] = None) -> str:
+    """Check a vendored model against its checksum; raise on mismatch."""
+    want = expected_digest(path, expected)
+    got  = directory_digest(path)
+    if want is None:
+        logger.warning("No checksum for %s; computed %s", path, got)
+    elif got != want:
+        raise ModelStoreError(f"Checksum mismatch for {path}: expected {want}, got {got}")
+    return got
+
+
+def load_movenet(
+    path: str = settings.MOVENET_PATH,
+    url: str = settings.MOVENET_URL,
+    expected_sha256: Optional[str] = settings.MOVENET_SHA256,
+    allow_download: bool = settings.MOVENET_ALLOW_DOWNLOAD,
+):
+    """
+    Load MoveNet from the local store, falling back to TF Hub only when the
+    store is empty and downloads are allowed.
+    """
+    if os.path.isdir(path):
+        start = time.perf_counter()
+        verify(path, expected_sha256)
+        verified = time.perf_counter()
+        model = tf.saved_model.load(path)
+        logger.info(
+            "MoveNet cold start from %s: verify %.2fs, load %.2fs",
+            path, verified - start, time.perf_counter() - verified,
+        )
+        return model
+
+    if not allow_download:
+        raise ModelStoreError(
+            f"MoveNet not found at {path} and MOVENET_ALLOW_DOWNLOAD is off; "
+            "run scripts/fetch_movenet.py on a connected machine"
+        )
+
+    logger.warning("MoveNet not vendored at %s; downloading %s", path, url)
+    start = time.perf_counter()
+    model = hub.load(url)
+    logger.info("MoveNet cold start from %s: %.2fs", url, time.perf_counter() - start)
+    return model
+
+
+def vendor(url: str, path: str) -> str:
+    """Copy a TF Hub model into the local store and write its checksum."""
+    cached = hub.resolve(url)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    shutil.copytree(cached, path)
+    digest = directory_digest(path)
+    with open(os.path.join(path, CHECKSUM_FILE), "w") as fh:
+        fh.write(f"{digest}  {os.path.basename(path)}\n")
+    return digest
@@ -0,0 +1,183 @@
+# app/services/profiler.py
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import zipfile
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import tensorflow as tf
+
+from app.core.config import settings
+from app.services.backends import selected_backend
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusy(RuntimeError):
+    """Another profile is already being captured."""
+
+
+def camera_threads(camera) -> Dict[int, str]:
+    """ident → name of the pipeline and capture threads of one camera."""
+    names = {f"camera-{camera}", f"camera-{camera}-capture"}
+    return {t.ident: t.name for t in threading.enumerate() if t.name in names and t.ident}
+
+
+def fold(frame) -> str:
+    """Collapsed (flamegraph) stack of `frame`, root first."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def sample_stacks(threads: Dict[int, str], seconds: float, interval: float) -> Counter:
+    """
+    Sample the Python stacks of `threads` every `interval` seconds.
+    Returns counts of "thread;root;...;leaf" collapsed stacks.
+    """
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frames = sys._current_frames()
+        for ident, name in threads.items():
+            frame = frames.get(ident)
+            if frame is not None:
+                stacks[f"{name};{fold(frame)}"] += 1
+        del frames
+        time.sleep(interval)
+    return stacks
+
+
+def top_functions(stacks: Counter, n: int = 25) -> List[dict]:
+    """Leaf ("self") and inclusive sample counts per function."""
+    own, total = Counter(), Counter()
+    for stack, count in stacks.items():
+        funcs = stack.split(";")[1:]
+        if funcs:
+            own[funcs[-1]] += count
+        for func in set(funcs):
+            total[func] += count
+    funcs = sorted(total, key=lambda f: (own[f], total[f]), reverse=True)[:n]
+    return [{"function": f, "self": own[f], "total": total[f]} for f in funcs]
+
+
+class Profiler:
+    """
+    Time-bounded profile of one running camera, packed as a zip:
+
+      stacks.folded  sampled Python stacks of the camera's pipeline and
+                     capture threads (flamegraph.pl / speedscope input)
+      summary.json   top functions, frame rate during the capture, options
+      tf/            opt-in TensorFlow profiler trace (open with TensorBoard's
+                     profile plugin); with the TF backend it covers the
+                     MoveNet and transformer ops, with TFLite neither
+
+    Only one profile runs at a time. Stack sampling touches just the
+    target camera's threads; the TF trace is process-wide and slows
+    every camera while it runs, which is why it is off by default and
+    the duration is capped by PROFILE_MAX_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def capture(
+        self,
+        broadcaster,
+        seconds: float,
+        interval: float = settings.PROFILE_SAMPLE_MS / 1000,
+        trace: bool = False,
+    ) -> bytes:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already being captured")
+        workdir = tempfile.mkdtemp(prefix="profile-")
+        try:
+            seconds  = min(max(seconds, 0.1), settings.PROFILE_MAX_SECONDS)
+            interval = max(interval, 0.001)
+            threads  = camera_threads(broadcaster.cam)
+            tf_dir   = os.path.join(workdir, "tf")
+            tracing  = trace and self._start_trace(tf_dir)
+
+            frames_before = broadcaster.frames
+            started_at    = datetime.now(timezone.utc)
+            started       = time.monotonic()
+            try:
+                stacks = sample_stacks(threads, seconds, interval)
+            finally:
+                if tracing:
+                    tracing = self._stop_trace()
+            elapsed = time.monotonic() - started
+            frames  = broadcaster.frames - frames_before
+
+            summary = {
+                "camera":        broadcaster.cam,
+                "started":       started_at.isoformat(timespec="seconds"),
+                "seconds":       round(elapsed, 3),
+                "interval_ms":   round(interval * 1000, 3),
+                "threads":       sorted(threads.values()),
+                "samples":       sum(stacks.values()),
+                "frames":        frames,
+                "fps":           round(frames / elapsed, 2) if elapsed else 0.0,
+                "tf_trace":      bool(tracing),
+                "tf_trace_note": self._trace_note(broadcaster) if tracing else None,
+                "status":        broadcaster.status(),
+                "top":           top_functions(stacks),
+            }
+            return self._pack(stacks, summary, tf_dir if tracing else None)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+            self._lock.release()
+
+    @staticmethod
+    def _trace_note(broadcaster) -> str:
+        backend = getattr(broadcaster.detector, "backend", None) or selected_backend()
+        if backend == "tflite":
+            return ("TFLite backend: MoveNet and the classifier run in the TFLite "
+                    "interpreter, so the trace contains no pose or transformer ops")
+        return "TF backend: the trace covers the MoveNet and transformer ops of every camera"
+
+    @staticmethod
+    def _start_trace(logdir: str) -> bool:
+        try:
+            tf.profiler.experimental.start(logdir)
+            return True
+        except Exception:  # already running elsewhere, or no profiler in this TF build
+            logger.warning("TensorFlow trace unavailable; sampling Python stacks only", exc_info=True)
+            return False
+
+    @staticmethod
+    def _stop_trace() -> bool:
+        try:
+            tf.profiler.experimental.stop()
+            return True
+        except Exception:
+            logger.warning("Stopping the TensorFlow trace failed", exc_info=True)
+            return False
+
+    @staticmethod
+    def _pack(stacks: Counter, summary: dict, tf_dir: Optional[str]) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("stacks.folded", "".join(f"{s} {n}\n" for s, n in stacks.most_common()))
+            zf.writestr("summary.json", json.dumps(summary, indent=2, default=str))
+            if tf_dir is not None:
+                for root, _, files in os.walk(tf_dir):
+                    for name in files:
+                        path = os.path.join(root, name)
+                        zf.write(path, os.path.join("tf", os.path.relpath(path, tf_dir)))
+        return buffer.getvalue()
+
+
+profiler = Profiler()
@@ -0,0 +1,54 @@
+# app/services/scheduler.py
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+from app.core.config import settings
+
+
+class InferenceScheduler:
+    """
+    Shared admission control for pose + transformer work.
+
+    Every camera pipeline runs on its own thread, and TensorFlow releases
+    the GIL while it computes, so cameras infer in parallel. The scheduler
+    caps how many run at once (one per core by default) so 16 cameras on
+    an 8-core box share the cores instead of thrashing them.
+    """
+
+    def __init__(self, max_workers: int = 0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._slots      = threading.BoundedSemaphore(self.max_workers)
+        self._lock       = threading.Lock()
+        self.active      = 0
+        self.completed   = 0
+        self.wait_seconds = 0.0
+
+    @contextmanager
+    def slot(self):
+        start = time.perf_counter()
+        self._slots.acquire()
+        with self._lock:
+            self.wait_seconds += time.perf_counter() - start
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active    -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers":  self.max_workers,
+                "active":       self.active,
+                "completed":    self.completed,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+scheduler = InferenceScheduler(settings.INFERENCE_WORKERS)
@@ -4,7 +4,6 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Generator
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from fastapi import Depends, HTTPException, status
@@ -13,10 +12,10 @@ from fastapi.security import OAuth2PasswordBearer
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.db.models import User, UserRole
+from app.services.user_cache import user_cache
+from app.services.hashing import hasher, pwd_context
 
-# Password hashing
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
+# Password hashing (cost parameters from Settings; see app/services/hashing.py)
 def hash_password(password: str) -> str:
     """Hash a plaintext password."""
     return pwd_context.hash(password)
@@ -40,8 +39,15 @@ def authenticate_user(
     Returns the User if successful, or None otherwise.
     """
     user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.password_hash):
+    if not user:
+        return None
+    valid, new_hash = hasher.call(pwd_context.verify_and_update, password, user.password_hash)
+    if not valid:
         return None
+    if new_hash:
+        # stored hash used outdated cost parameters
+        user.password_hash = new_hash
+        db.commit()
     return user
 
 
@@ -92,9 +98,13 @@ def get_current_user(
         user_id = int(sub)
     except JWTError:
         raise credentials_exc
-    user = db.query(User).get(user_id)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return db.merge(cached, load=False)
+    user = db.get(User, user_id)
     if not user:
         raise credentials_exc
+    user_cache.put(user)
     return user
 
 def get_current_active_user(
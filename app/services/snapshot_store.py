@@ -0,0 +1,85 @@
+# app/services/snapshot_store.py
+
+import os
+import re
+import hashlib
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class SnapshotStore:
+    """
+    Content-addressed store for alert snapshots.
+
+    Each JPEG is stored under its SHA-256 (root/ab/cd/<digest>.jpg) next to
+    a small thumbnail (<digest>.thumb.jpg). The same bytes always map to
+    the same file, so writes are idempotent and served files never change,
+    which lets clients cache them forever.
+    """
+
+    def __init__(self, root: str = settings.SNAPSHOT_DIR, thumb_width: int = settings.SNAPSHOT_THUMB_WIDTH):
+        self.root        = root
+        self.thumb_width = thumb_width
+
+    @staticmethod
+    def valid(digest: str) -> bool:
+        return bool(DIGEST_RE.match(digest))
+
+    def path(self, digest: str, thumb: bool = False) -> str:
+        if not self.valid(digest):
+            raise ValueError(f"Not a snapshot digest: {digest!r}")
+        suffix = ".thumb.jpg" if thumb else ".jpg"
+        return os.path.join(self.root, digest[:2], digest[2:4], digest + suffix)
+
+    def find(self, digest: str, thumb: bool = False) -> Optional[str]:
+        """Path of a stored snapshot, or None."""
+        if not self.valid(digest):
+            return None
+        path = self.path(digest, thumb)
+        return path if os.path.exists(path) else None
+
+    def put(self, jpeg: bytes) -> str:
+        """Store a JPEG and its thumbnail; returns the digest."""
+        digest = hashlib.sha256(jpeg).hexdigest()
+        full   = self.path(digest)
+        if not os.path.exists(full):
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            self._write(full, jpeg)
+        thumb = self.path(digest, thumb=True)
+        if not os.path.exists(thumb):
+            data = self.thumbnail(jpeg)
+            if data is not None:
+                self._write(thumb, data)
+        return digest
+
+    def thumbnail(self, jpeg: bytes) -> Optional[bytes]:
+        img = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            logger.warning("Snapshot is not a decodable image; no thumbnail")
+            return None
+        h, w = img.shape[:2]
+        if w > self.thumb_width:
+            size = (self.thumb_width, max(1, round(h * self.thumb_width / w)))
+            img  = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        return buffer.tobytes() if ok else None
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        # write-then-rename so readers never see a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+
+snapshot_store = SnapshotStore()
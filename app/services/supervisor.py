@@ -0,0 +1,87 @@
+# app/services/supervisor.py
+
+import time
+import logging
+import threading
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.broadcaster import get_broadcaster, make_detector
+from app.services.scheduler   import scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class CameraSupervisor:
+    """
+    Runs one pipeline per configured camera and restarts the ones that stall.
+
+    A camera counts as stalled when its pipeline thread has died or has not
+    produced a frame for `stall_seconds`.
+    """
+
+    def __init__(
+        self,
+        camera_indices: List[int],
+        stall_seconds: float = settings.CAMERA_STALL_SECONDS,
+    ):
+        self.camera_indices = list(camera_indices)
+        self.stall_seconds  = stall_seconds
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def broadcasters(self):
+        return {cam: get_broadcaster(cam) for cam in self.camera_indices}
+
+    def start(self) -> None:
+        for cam, bc in self.broadcasters.items():
+            logger.info("Starting camera %s", cam)
+            bc.start()
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._stop.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="camera-supervisor", daemon=True
+            )
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for bc in self.broadcasters.values():
+            bc.stop()
+
+    def start_detection(self, normal_dir: str, violent_dir: str, model_path: str) -> None:
+        """Train or load the shared classifier once, then start every camera."""
+        make_detector(self.camera_indices[0]).train_or_load(
+            normal_dir, violent_dir, model_path
+        )
+        self.start()
+
+    def check(self) -> None:
+        now = time.monotonic()
+        for cam, bc in self.broadcasters.items():
+            if not bc.pinned:
+                continue
+            stalled = now - bc.last_frame_at > self.stall_seconds
+            if not bc.running or stalled:
+                logger.warning(
+                    "Camera %s %s; restarting", cam, "stalled" if bc.running else "stopped"
+                )
+                bc.restart()
+
+    def _watch(self):
+        interval = max(self.stall_seconds / 2, 0.5)
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Camera supervisor check failed")
+
+    def status(self) -> dict:
+        return {
+            "cameras":   [bc.status() for bc in self.broadcasters.values()],
+            "scheduler": scheduler.stats(),
+        }
+
+
+supervisor = CameraSupervisor(settings.CAMERA_INDICES)
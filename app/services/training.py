@@ -0,0 +1,171 @@
+# app/services/training.py
+
+import os
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+from app.core.config import settings
+from app.services.feature_store import file_digest
+from app.services.features import poses_to_features
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+
+def list_clips(normal_dir: str, violent_dir: str) -> List[Tuple[str, int]]:
+    return [
+        (os.path.join(folder, fn), label)
+        for folder, label in ((normal_dir, 0), (violent_dir, 1))
+        for fn in sorted(os.listdir(folder))
+        if fn.lower().endswith(VIDEO_EXTS)
+    ]
+
+
+class ClipStore:
+    """
+    Per-clip pose feature sequences, one (frames, feat_dim) .npy per clip
+    content hash, read back memory-mapped. Same size/mtime → hash
+    shortcut as FeatureStore, so unchanged clips are never re-decoded.
+    """
+
+    def __init__(self, root: str = settings.FEATURES_PATH, feat_dim: int = 68, frame_stride: int = 1):
+        self.dir        = os.path.join(root, f"clips-{feat_dim}-s{frame_stride}")
+        self.index_path = os.path.join(self.dir, "index.json")
+        os.makedirs(self.dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as fh:
+                self.index = json.load(fh)
+
+    def _npy(self, digest: str) -> str:
+        return os.path.join(self.dir, f"{digest}.npy")
+
+    def lookup(self, path: str) -> Optional[str]:
+        entry = self.index.get(path)
+        if entry is None:
+            return None
+        st = os.stat(path)
+        if (st.st_size, st.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+            if file_digest(path) != entry["sha256"]:
+                return None
+            entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+        npy = self._npy(entry["sha256"])
+        return npy if os.path.exists(npy) else None
+
+    def add(self, path: str, feats: np.ndarray) -> str:
+        st     = os.stat(path)
+        digest = file_digest(path)
+        npy    = self._npy(digest)
+        np.save(npy, np.ascontiguousarray(feats, dtype=np.float32))
+        with self._lock:
+            self.index[path] = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        return npy
+
+    def flush(self) -> None:
+        with self._lock:
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w") as fh:
+                json.dump(self.index, fh)
+            os.replace(tmp, self.index_path)
+
+
+def extract_clip(pose, path: str, max_people: int, frame_stride: int = 1) -> np.ndarray:
+    """(frames, max_people*34) pose features for every `frame_stride`-th frame."""
+    cap   = cv2.VideoCapture(path)
+    poses, sizes = [], []
+    i = 0
+    try:
+        while True:
+            ok = cap.grab()
+            if not ok:
+                break
+            if i % frame_stride == 0:
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+                poses.append(pose.detect(frame))
+                sizes.append(frame.shape[:2])
+            i += 1
+    finally:
+        cap.release()
+    feat_dim = max_people * 34
+    if not poses:
+        return np.zeros((0, feat_dim), dtype=np.float32)
+    return poses_to_features(np.stack(poses), np.array(sizes), max_people)
+
+
+def prepare_clips(
+    pose,
+    items: List[Tuple[str, int]],
+    max_people: int,
+    frame_stride: int = settings.TRAIN_FRAME_STRIDE,
+    workers: int = settings.EXTRACT_POSE_WORKERS,
+) -> List[Tuple[str, int]]:
+    """Cached feature file per clip, extracting only new/changed clips."""
+    store = ClipStore(settings.FEATURES_PATH, max_people * 34, frame_stride)
+
+    def one(item):
+        path, label = item
+        npy = store.lookup(path)
+        if npy is None:
+            npy = store.add(path, extract_clip(pose, path, max_people, frame_stride))
+            logger.info("Extracted pose sequence for %s", path)
+        return npy, label
+
+    with ThreadPoolExecutor(max(workers, 1), thread_name_prefix="clip") as pool:
+        clips = list(pool.map(one, items))
+    store.flush()
+    return clips
+
+
+def window_dataset(
+    clips: List[Tuple[str, int]],
+    seq_len: int,
+    feat_dim: int,
+    window_stride: int = settings.TRAIN_WINDOW_STRIDE,
+    batch_size: int = 16,
+    shuffle_buffer: int = settings.TRAIN_SHUFFLE_BUFFER,
+    cache_path: str = settings.TRAIN_CACHE_PATH,
+) -> tf.data.Dataset:
+    """
+    Sliding (seq_len, feat_dim) windows streamed from memory-mapped clips.
+
+    Clips are shuffled and interleaved so each batch mixes several clips;
+    nothing but the shuffle buffer is held in memory. With `cache_path`
+    set, the windows are cached to disk after the first epoch.
+    """
+
+    def windows(npy, label):
+        arr = np.load(npy.decode(), mmap_mode="r")
+        for start in range(0, len(arr) - seq_len + 1, window_stride):
+            yield np.asarray(arr[start:start + seq_len]), label
+
+    if not clips:
+        raise ValueError("No training clips found (TRAIN_MODE=clips needs video files in the data folders)")
+
+    paths  = [npy for npy, _ in clips]
+    labels = [label for _, label in clips]
+    spec   = (
+        tf.TensorSpec((seq_len, feat_dim), tf.float32),
+        tf.TensorSpec((), tf.int64),
+    )
+    ds = tf.data.Dataset.from_tensor_slices((paths, tf.constant(labels, tf.int64)))
+    ds = ds.shuffle(len(paths), reshuffle_each_iteration=True)
+    ds = ds.interleave(
+        lambda p, l: tf.data.Dataset.from_generator(windows, output_signature=spec, args=(p, l)),
+        cycle_length=min(len(paths), 8),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=False,
+    )
+    if cache_path:
+        ds = ds.cache(cache_path)
+    return ds.shuffle(shuffle_buffer).batch(batch_size).prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,129 @@
+# app/services/user_cache.py
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.core.config import settings
+from app.db.models import User
+
+# changing any of these must drop the cached user
+AUTH_FIELDS = ("is_active", "role", "password_hash")
+
+
+class UserCache:
+    """
+    Bounded LRU + TTL cache of authenticated users, keyed by token subject.
+
+    Values are detached copies of the row; callers merge them into their
+    own session with load=False, which attaches without a query. Entries
+    are dropped when they expire, when the cache is full (least recently
+    used first) and whenever a commit changes a user's active flag, role
+    or password (see the ORM hooks below).
+    """
+
+    def __init__(self, max_size: int = settings.USER_CACHE_SIZE, ttl: float = settings.USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl      = ttl
+        self._lock    = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+
+        self.hits          = 0
+        self.misses        = 0
+        self.evictions     = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user: User) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        copy = detached_copy(user)
+        with self._lock:
+            self._entries[copy.id] = (time.monotonic() + self.ttl, copy)
+            self._entries.move_to_end(copy.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size":          len(self._entries),
+                "max_size":      self.max_size,
+                "ttl":           self.ttl,
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "hit_rate":      round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions":     self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def detached_copy(user: User) -> User:
+    """Column values of `user` in a new, detached instance (no session, no lazy loads)."""
+    values = {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+    copy = User(**values)
+    make_transient_to_detached(copy)
+    return copy
+
+
+user_cache = UserCache()
+
+
+# --- invalidation ---
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target: User) -> None:
+    state = sa_inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in AUTH_FIELDS):
+        _mark(target)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target: User) -> None:
+    _mark(target)
+
+
+def _mark(target: User) -> None:
+    # drop now, and again after commit so a lookup racing the transaction
+    # can't re-cache the old row
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("user_cache_invalidate", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    for user_id in session.info.pop("user_cache_invalidate", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("user_cache_invalidate", None)
@@ -0,0 +1,98 @@
+# app/services/window.py
+
+import numpy as np
+
+
+class SequenceWindow:
+    """
+    Sliding window over the last `seq_len` feature vectors.
+
+    Backed by one preallocated float32 array of 2*seq_len rows: every row
+    is written twice (at i and i+seq_len), so the newest `seq_len` rows are
+    always a contiguous slice and view() never copies.
+    """
+
+    def __init__(self, seq_len: int, feat_dim: int):
+        self.seq_len  = seq_len
+        self.feat_dim = feat_dim
+        self._buf   = np.zeros((2 * seq_len, feat_dim), dtype=np.float32)
+        self._pos   = 0
+        self._count = 0
+
+    @property
+    def slot(self) -> np.ndarray:
+        """Row for the next frame; fill it in place, then call advance()."""
+        return self._buf[self._pos]
+
+    def advance(self) -> None:
+        self._buf[self._pos + self.seq_len] = self._buf[self._pos]
+        self._pos   = (self._pos + 1) % self.seq_len
+        self._count = min(self._count + 1, self.seq_len)
+
+    def append(self, feat: np.ndarray) -> None:
+        self.slot[:] = feat
+        self.advance()
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.seq_len
+
+    def __len__(self) -> int:
+        return self._count
+
+    def view(self) -> np.ndarray:
+        """(1, seq_len, feat_dim) view, oldest → newest, sharing memory."""
+        return self._buf[np.newaxis, self._pos:self._pos + self.seq_len]
+
+    def clear(self) -> None:
+        self._pos   = 0
+        self._count = 0
+
+
+class ScoreSmoother:
+    """
+    O(1) smoothing of per-frame scores: mean of the last `window` scores
+    and an exponential moving average, both updated incrementally.
+    """
+
+    def __init__(self, window: int, mode: str = "mean", alpha: float = 0.0):
+        if mode not in ("mean", "ema"):
+            raise ValueError("mode must be 'mean' or 'ema'")
+        self.window = window
+        self.mode   = mode
+        self.alpha  = alpha or 2.0 / (window + 1)
+        self._scores = np.zeros(window, dtype=np.float64)
+        self._pos    = 0
+        self._count  = 0
+        self._sum    = 0.0
+        self.ema: float = 0.0
+
+    def update(self, score: float) -> float:
+        self._sum += score - self._scores[self._pos]
+        self._scores[self._pos] = score
+        self._pos = (self._pos + 1) % self.window
+        if self._pos == 0:
+            # resync once per lap so float error can't accumulate
+            self._sum = float(self._scores.sum())
+
+        self.ema = score if self._count == 0 else self.ema + self.alpha * (score - self.ema)
+        self._count = min(self._count + 1, self.window)
+        return self.value
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def value(self) -> float:
+        return self.ema if self.mode == "ema" else self.mean
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        self._scores[:] = 0.0
+        self._pos   = 0
+        self._count = 0
+        self._sum   = 0.0
+        self.ema    = 0.0
@@ -0,0 +1,129 @@
+# app/websockets/scores.py
+"""
+Per-frame detector results over a WebSocket.
+
+    /ws/scores/{camera_id}?rate=5&keypoints=true&format=json
+
+JSON messages:
+    {"camera": 0, "frame": 812, "ts": 1718000000.1, "score": 0.41,
+     "smoothed": 0.37, "level": "normal", "keypoints": [[[x, y, s] * 17], ...]}
+
+`score` is null on frames the detector skipped; `keypoints` (normalised
+0..1, highest-scoring person first) is only sent when asked for.
+
+Binary messages (format=binary), little-endian:
+    u8 version, u16 camera, u32 frame, f64 ts, f32 score, f32 smoothed,
+    u8 level, u8 people, then people*17*3 f32 (x, y, s)
+with NaN for a missing score and level codes as in LEVELS.
+"""
+
+import json
+import math
+import struct
+from typing import Optional
+
+import anyio
+import numpy as np
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+
+from app.core.config import settings
+from app.services.broadcaster import get_broadcaster
+from app.services.features import NUM_KEYPOINTS, POSE_SCORE
+
+router = APIRouter()
+
+LEVELS  = ("gathering", "normal", "warning", "urgent")
+HEADER  = struct.Struct("<BHIdffBB")
+VERSION = 1
+
+
+def top_people(poses: Optional[np.ndarray], max_people: int, min_score: float) -> np.ndarray:
+    """(n, 17, 3) keypoints as (x, y, score) for the best-scoring people."""
+    if poses is None:
+        return np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)
+    poses = np.asarray(poses, dtype=np.float32)
+    order = np.argsort(-poses[:, POSE_SCORE], kind="stable")[:max_people]
+    order = order[poses[order, POSE_SCORE] >= min_score]
+    kpts  = poses[order, :NUM_KEYPOINTS * 3].reshape(-1, NUM_KEYPOINTS, 3)
+    return kpts[..., [1, 0, 2]]  # MoveNet rows are (y, x, s)
+
+
+def _num(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 4)
+
+
+def encode_json(event: dict, keypoints: bool) -> str:
+    msg = {
+        "camera":   event["camera"],
+        "frame":    event["frame"],
+        "ts":       round(event["ts"], 3),
+        "score":    _num(event["score"]),
+        "smoothed": _num(event["smoothed"]),
+        "level":    event["level"],
+    }
+    if keypoints:
+        people = top_people(event["poses"], settings.MAX_PEOPLE, settings.WS_PERSON_SCORE)
+        msg["keypoints"] = np.round(people, 3).tolist()
+    return json.dumps(msg, separators=(",", ":"))
+
+
+def encode_binary(event: dict, keypoints: bool) -> bytes:
+    people = (
+        top_people(event["poses"], settings.MAX_PEOPLE, settings.WS_PERSON_SCORE)
+        if keypoints else np.zeros((0, NUM_KEYPOINTS, 3), dtype=np.float32)
+    )
+    nan = lambda v: math.nan if v is None else float(v)
+    level = LEVELS.index(event["level"]) if event["level"] in LEVELS else 255
+    header = HEADER.pack(
+        VERSION, event["camera"], event["frame"], event["ts"],
+        nan(event["score"]), nan(event["smoothed"]), level, len(people),
+    )
+    return header + people.astype("<f4").tobytes()
+
+
+@router.websocket("/ws/scores/{camera_id}")
+async def scores(
+    websocket: WebSocket,
+    camera_id: int,
+    rate:      float = Query(settings.WS_SCORE_RATE, ge=0, le=60, description="max messages/sec; 0 = every frame"),
+    keypoints: bool  = Query(False),
+    format:    str   = Query("json", pattern="^(json|binary)$"),
+):
+    if camera_id not in settings.CAMERA_INDICES:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Unknown camera")
+        return
+    await websocket.accept()
+
+    broadcaster = get_broadcaster(camera_id)
+    listener    = broadcaster.subscribe_events(max_rate=rate)
+
+    async def pump():
+        try:
+            while True:
+                event = await listener.get_async()
+                if event is None:  # pipeline stopped
+                    await websocket.close()
+                    break
+                if format == "binary":
+                    await websocket.send_bytes(encode_binary(event, keypoints))
+                else:
+                    await websocket.send_text(encode_json(event, keypoints))
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        tg.cancel_scope.cancel()
+
+    async def watch():
+        # returns as soon as the client goes away, even if no events flow
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        tg.cancel_scope.cancel()
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(pump)
+            tg.start_soon(watch)
+    finally:
+        broadcaster.unsubscribe(listener)
@@ -0,0 +1,59 @@
+# scripts/analyze_video.py
+"""
+Re-scan recorded footage offline: per-second violence score timeline and
+flagged intervals for each file, computed on a local process pool.
+
+    python scripts/analyze_video.py recording1.mp4 recording2.mp4 [--out results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.services.batch_analysis import AnalysisJobs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--out", help="write all results to this JSON file")
+    args = parser.parse_args()
+
+    jobs = AnalysisJobs()
+    submitted = [jobs.submit(os.path.abspath(path)) for path in args.videos]
+    pending = {job["id"] for job in submitted}
+    last = {}
+    while pending:
+        time.sleep(1.0)
+        for job_id in list(pending):
+            job = jobs.get(job_id)
+            if last.get(job_id) != job["status"]:
+                last[job_id] = job["status"]
+                print(f"{job['file']}: {job['status']}")
+            if job["status"] in ("done", "failed", "cancelled"):
+                pending.discard(job_id)
+
+    results = [jobs.get(job["id"]) for job in submitted]
+    jobs.shutdown()
+    for job in results:
+        if job["status"] != "done":
+            print(f"{job['file']}: {job['error']}")
+            continue
+        res = job["result"]
+        print(f"{job['file']}: {res['frames']} frames in {res['seconds']}s")
+        for iv in res["intervals"]:
+            print(f"  {iv['level']:7s} {iv['start']:>6d}s – {iv['end']:>6d}s  peak {iv['peak']:.2f}")
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
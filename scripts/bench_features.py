@@ -0,0 +1,69 @@
+# scripts/bench_features.py
+"""
+Micro-benchmark: per-frame cost of MoveNet → feature conversion,
+the original per-keypoint Python loop vs the vectorised extractor.
+
+    python scripts/bench_features.py [--frames 2000] [--batch 16]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.services.features import poses_to_features
+
+
+def loop_features(poses, orig_size):
+    """The pre-vectorisation implementation, kept here as the reference."""
+    h, w = orig_size
+    feats = []
+    for p in poses:
+        kpts   = p[:51].reshape(17,3)
+        coords = []
+        for y,x,s in kpts:
+            coords += [0.0,0.0] if s < 0.2 else [x*w, y*h]
+        feats.extend(coords)
+    return np.array(feats, dtype=np.float32)
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6  # µs per call
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--max-people", type=int, default=2)
+    args = parser.parse_args()
+
+    rng   = np.random.default_rng(0)
+    size  = (480, 640)
+    poses = rng.random((args.batch, 6, 56), dtype=np.float32)
+    out1  = np.empty(args.max_people * 34, dtype=np.float32)
+    outb  = np.empty((args.batch, args.max_people * 34), dtype=np.float32)
+
+    loop_us = timed(lambda: loop_features(poses[0][:args.max_people], size), args.frames)
+    vec_us  = timed(lambda: poses_to_features(poses[0], size, args.max_people, out=out1), args.frames)
+    batch_us = timed(
+        lambda: poses_to_features(poses, size, args.max_people, out=outb),
+        max(args.frames // args.batch, 1),
+    ) / args.batch
+
+    print(f"python loop      : {loop_us:8.1f} µs/frame")
+    print(f"vectorised       : {vec_us:8.1f} µs/frame  ({loop_us / vec_us:.1f}x)")
+    print(f"vectorised x{args.batch:<3d} : {batch_us:8.1f} µs/frame  ({loop_us / batch_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
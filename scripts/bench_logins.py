@@ -0,0 +1,77 @@
+# scripts/bench_logins.py
+"""
+Login throughput vs tail latency through the bounded hashing pool.
+
+Each simulated client logs in back to back (one Argon2 verify per
+login) for --seconds; every concurrency level reports logins/sec, p50
+and p99 latency, and how many logins were rejected with a 503.
+
+    python scripts/bench_logins.py [--clients 1 4 16 64] [--seconds 5]
+        [--workers 2] [--queue 16] [--time-cost 3] [--memory-cost 65536]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.core.config import settings
+from app.services.hashing import HashExecutor, HashingOverloaded, make_context
+
+
+async def run_level(hasher, ctx, stored, clients: int, seconds: float):
+    latencies, rejected = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal rejected
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await hasher.run(ctx.verify_and_update, "correct horse", stored)
+            except HashingOverloaded:
+                rejected += 1
+                await asyncio.sleep(0.05)  # a real client would honour Retry-After
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return len(latencies) / elapsed, np.percentile(lat, 50), np.percentile(lat, 99), rejected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=settings.HASH_WORKERS)
+    parser.add_argument("--queue", type=int, default=settings.HASH_QUEUE_MAX)
+    parser.add_argument("--time-cost", type=int, default=settings.ARGON2_TIME_COST)
+    parser.add_argument("--memory-cost", type=int, default=settings.ARGON2_MEMORY_COST)
+    parser.add_argument("--parallelism", type=int, default=settings.ARGON2_PARALLELISM)
+    args = parser.parse_args()
+
+    ctx    = make_context(args.time_cost, args.memory_cost, args.parallelism)
+    stored = ctx.hash("correct horse")
+    hasher = HashExecutor(args.workers, args.queue)
+
+    print(f"argon2 t={args.time_cost} m={args.memory_cost}KiB p={args.parallelism}, "
+          f"{args.workers} workers, queue {args.queue}")
+    print(f"{'clients':>8} {'logins/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'rejected':>9}")
+    for clients in args.clients:
+        rate, p50, p99, rejected = asyncio.run(run_level(hasher, ctx, stored, clients, args.seconds))
+        print(f"{clients:>8} {rate:>10.1f} {p50:>9.1f} {p99:>9.1f} {rejected:>9}")
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# scripts/bench_pipeline.py
+"""
+Stage-level benchmark of the live detection path, offline on CPU.
+
+Frames are synthetic and MoveNet is replaced by a stub that returns
+fixed poses (so nothing is downloaded and the numbers isolate our own
+code); the transformer is the real, untrained architecture. Every stage
+of ViolenceDetector.process_frame and the broadcaster's encode is timed
+at several resolutions and seq_len / max_people values.
+
+    python scripts/bench_pipeline.py [--out bench_pipeline.json] [--quick]
+    python scripts/bench_pipeline.py --compare baseline.json [--current bench_pipeline.json]
+        [--threshold 0.15]
+
+--compare exits non-zero when any stage's median is more than
+`threshold` slower than in the baseline. Use --pose movenet to time the
+vendored MoveNet instead of the stub.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import tensorflow as tf
+
+from app.services.broadcaster import Rendition
+from app.services.detector import MoveNetMultiPose, ViolenceDetector
+from app.services.gating import InferenceGate
+from app.services.governor import QualityGovernor
+from app.services.model_registry import registry
+from app.services.window import SequenceWindow
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+SEQ_LENS    = [1, 16]
+MAX_PEOPLE  = [1, 2, 4]
+
+
+class StubPoseBackend:
+    """Stands in for MoveNet: fixed, confident poses for 6 people."""
+
+    def __init__(self, seed: int = 0):
+        poses = np.random.default_rng(seed).random((6, 56), dtype=np.float32)
+        poses[:, 2:51:3] = 0.9   # keypoint scores
+        poses[:, 55]     = np.linspace(0.9, 0.4, 6, dtype=np.float32)
+        self.poses = poses
+
+    def __call__(self, rgb: np.ndarray) -> np.ndarray:
+        return self.poses.copy()
+
+
+def stub_movenet() -> MoveNetMultiPose:
+    pose = MoveNetMultiPose.__new__(MoveNetMultiPose)
+    pose.model, pose.backend, pose.input_size = None, StubPoseBackend(), 256
+    return pose
+
+
+def frames(width: int, height: int, n: int = 8) -> List[np.ndarray]:
+    rng = np.random.default_rng(width)
+    return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def timeit(fn: Callable[[int], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    for i in range(warmup):
+        fn(i)
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        fn(i)
+        samples[i] = (time.perf_counter_ns() - start) / 1000
+    return {
+        "median_us":  round(float(np.median(samples)), 2),
+        "p90_us":     round(float(np.percentile(samples, 90)), 2),
+        "iterations": iterations,
+    }
+
+
+def key(stage: str, params: dict) -> str:
+    return stage + "[" + ",".join(f"{k}={v}" for k, v in sorted(params.items())) + "]"
+
+
+def run_suite(args) -> dict:
+    results = []
+
+    def record(stage, params, fn, iterations=args.iterations):
+        stats = timeit(fn, iterations)
+        results.append({"stage": stage, "params": params, "key": key(stage, params), **stats})
+        print(f"{key(stage, params):55} {stats['median_us']:10.1f} µs  (p90 {stats['p90_us']:.1f})")
+
+    pose = MoveNetMultiPose() if args.pose == "movenet" else stub_movenet()
+    resolutions = RESOLUTIONS[:2] if args.quick else RESOLUTIONS
+    seq_lens    = SEQ_LENS[:1] if args.quick else SEQ_LENS
+    max_people  = MAX_PEOPLE[1:2] if args.quick else MAX_PEOPLE
+
+    # --- per-resolution stages ---
+    for w, h in resolutions:
+        res = f"{w}x{h}"
+        fs  = frames(w, h)
+        pick = lambda i: fs[i % len(fs)]
+        record("preprocess", {"res": res}, lambda i: pose.preprocess(pick(i)))
+        record("detect", {"res": res, "pose": args.pose}, lambda i: pose.detect(pick(i)))
+        gate = InferenceGate(enabled=True)
+        record("motion_gate", {"res": res}, lambda i: gate.motion(pick(i)))
+        record("annotate", {"res": res}, lambda i: cv2.putText(
+            pick(i).copy(), "Normal (0.12)", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 2
+        ))
+        for rendition in (Rendition(), Rendition(quality=70), Rendition(width=320, quality=70)):
+            record("imencode", {"res": res, "rendition": rendition.label},
+                   lambda i, r=rendition: r.encode(pick(i)))
+
+    # --- feature / window / classifier stages ---
+    poses = pose.detect(frames(640, 480, 1)[0])
+    for people in max_people:
+        out = np.empty(people * 34, dtype=np.float32)
+        record("keypoints_to_features", {"max_people": people},
+               lambda i: pose.keypoints_to_features(poses, (480, 640), people, out=out))
+        for seq_len in seq_lens:
+            feat_dim = people * 34
+            window   = SequenceWindow(seq_len, feat_dim)
+            def step(i, window=window):
+                window.slot[:] = i
+                window.advance()
+                return window.view()
+            record("window", {"seq_len": seq_len, "max_people": people}, step)
+
+            detector = ViolenceDetector(camera_index=None, seq_len=seq_len, max_people=people)
+            seq = np.random.default_rng(0).random((1, seq_len, feat_dim), dtype=np.float32)
+            record("infer", {"seq_len": seq_len, "max_people": people},
+                   lambda i, d=detector: d._infer(seq), iterations=max(args.iterations // 4, 10))
+
+    # --- whole frame, as the broadcaster runs it ---
+    registry.put(("movenet", ViolenceDetector(camera_index=None).backend), pose)
+    for w, h in resolutions:
+        fs = frames(w, h)
+        for people in max_people:
+            for seq_len in seq_lens:
+                detector = ViolenceDetector(camera_index=None, seq_len=seq_len, max_people=people)
+                # always run the full path: no frame skipping, no motion gating
+                detector.governor = QualityGovernor(enabled=False)
+                detector.gate     = InferenceGate(enabled=False)
+                record("process_frame", {"res": f"{w}x{h}", "seq_len": seq_len, "max_people": people},
+                       lambda i, d=detector: d.process_frame(fs[i % len(fs)]),
+                       iterations=max(args.iterations // 4, 10))
+
+    return {
+        "meta": {
+            "created":    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "platform":   platform.platform(),
+            "python":     platform.python_version(),
+            "cpus":       os.cpu_count(),
+            "numpy":      np.__version__,
+            "opencv":     cv2.__version__,
+            "tensorflow": tf.__version__,
+            "pose":       args.pose,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print per-stage ratios; returns the number of regressions."""
+    old = {r["key"]: r for r in baseline["results"]}
+    regressions = 0
+    print(f"{'stage':55} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for r in current["results"]:
+        base = old.get(r["key"])
+        if base is None:
+            print(f"{r['key']:55} {'-':>10} {r['median_us']:10.1f}    new")
+            continue
+        ratio = r["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag, regressions = "  REGRESSION", regressions + 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{r['key']:55} {base['median_us']:10.1f} {r['median_us']:10.1f} {ratio:6.2f}x{flag}")
+    missing = set(old) - {r["key"] for r in current["results"]}
+    for k in sorted(missing):
+        print(f"{k:55} {old[k]['median_us']:10.1f} {'-':>10}    missing")
+    print(f"\n{regressions} regression(s) over {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default="bench_pipeline.json")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--quick", action="store_true", help="fewer resolutions / sizes")
+    parser.add_argument("--pose", choices=("stub", "movenet"), default="stub")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to compare against")
+    parser.add_argument("--current", help="compare this results file instead of running now")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current) as fh:
+            current = json.load(fh)
+    else:
+        current = run_suite(args)
+        with open(args.out, "w") as fh:
+            json.dump(current, fh, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        sys.exit(1 if compare(baseline, current, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# scripts/convert_tflite.py
+"""
+Convert a SavedModel to TFLite for the CPU backend (INFERENCE_BACKEND=tflite)
+and check that its outputs stay within a tolerance of the TensorFlow model.
+
+    python scripts/convert_tflite.py                      # violence transformer
+    python scripts/convert_tflite.py --kind pose          # vendored MoveNet
+    python scripts/convert_tflite.py --quantize int8 --tolerance 0.03
+
+Quantization:
+    none     float32 weights
+    float16  float16 weights (half the size, near-identical scores)
+    int8     dynamic-range int8 weights, float activations
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.core.config import settings
+from app.services.backends import TFLiteBackend
+
+
+def convert(src: str, quantize: str) -> bytes:
+    converter = tf.lite.TFLiteConverter.from_saved_model(src)
+    if quantize in ("float16", "int8"):
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+
+def sample_inputs(kind: str, signature, n: int, rng):
+    spec  = next(iter(signature.structured_input_signature[1].values()))
+    if kind == "pose":
+        size = settings.POSE_INPUT_MAX
+        for _ in range(n):
+            yield rng.integers(0, 256, (1, size, size, 3)).astype(spec.dtype.as_numpy_dtype)
+    else:
+        shape = [1 if d is None else d for d in spec.shape]
+        for _ in range(n):
+            # keypoint features are pixel coordinates, mostly in [0, 720)
+            yield (rng.random(shape) * 720).astype(np.float32)
+
+
+def compare(src: str, dst: str, kind: str, samples: int, threads: int) -> float:
+    signature = tf.saved_model.load(src).signatures["serving_default"]
+    lite      = TFLiteBackend(dst, num_threads=threads)
+    rng       = np.random.default_rng(0)
+    worst     = 0.0
+    for inp in sample_inputs(kind, signature, samples, rng):
+        expected = next(iter(signature(tf.constant(inp)).values())).numpy()
+        got      = lite.run(inp)
+        if kind == "pose":
+            # compare keypoint coordinates + scores of the first person
+            expected, got = expected[..., 0, :51], got[..., 0, :51]
+        worst = max(worst, float(np.max(np.abs(expected - got))))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kind", choices=("classifier", "pose"), default="classifier")
+    parser.add_argument("--src")
+    parser.add_argument("--dst")
+    parser.add_argument("--quantize", choices=("none", "float16", "int8"), default="float16")
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    parser.add_argument("--samples", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=settings.TFLITE_THREADS)
+    args = parser.parse_args()
+
+    if args.kind == "pose":
+        src = args.src or settings.MOVENET_PATH
+        dst = args.dst or settings.TFLITE_POSE_PATH
+    else:
+        src = args.src or settings.MODEL_PATH
+        dst = args.dst or settings.TFLITE_CLASSIFIER_PATH
+
+    flatbuffer = convert(src, args.quantize)
+    with open(dst, "wb") as fh:
+        fh.write(flatbuffer)
+    print(f"Wrote {dst} ({len(flatbuffer) / 1e6:.2f} MB, {args.quantize})")
+
+    worst = compare(src, dst, args.kind, args.samples, args.threads)
+    print(f"Max |TF - TFLite| over {args.samples} samples: {worst:.5f} (tolerance {args.tolerance})")
+    if worst > args.tolerance:
+        print("FAILED: TFLite model drifts beyond tolerance")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
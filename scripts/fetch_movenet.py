@@ -0,0 +1,34 @@
+# scripts/fetch_movenet.py
+"""
+Vendor MoveNet MultiPose into the local model store (MOVENET_PATH) so the
+app can start without network access. Run on a connected machine, then
+ship the resulting directory (including checksum.sha256) to the site.
+
+    python scripts/fetch_movenet.py [--url URL] [--dest DIR]
+"""
+
+import os
+import sys
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.core.config import settings
+from app.services.model_store import vendor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=settings.MOVENET_URL)
+    parser.add_argument("--dest", default=settings.MOVENET_PATH)
+    args = parser.parse_args()
+
+    digest = vendor(args.url, args.dest)
+    print(f"Vendored {args.url} → {args.dest}")
+    print(f"sha256: {digest}")
+
+
+if __name__ == "__main__":
+    main()
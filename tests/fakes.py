@@ -0,0 +1,67 @@
+# tests/fakes.py
+"""Camera, detector and pose stand-ins shared by the test modules."""
+
+import threading
+import time
+
+import numpy as np
+
+from app.services.broadcaster import CameraBroadcaster
+
+
+class FakeCapture:
+    def __init__(self, n_frames):
+        self.remaining = n_frames
+        self.released  = False
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.remaining == 0:
+            return False, None
+        self.remaining -= 1
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+class FakeDetector:
+    trained = True
+
+    def process_frame(self, frame):
+        return frame, None
+
+
+class SlowDetector(FakeDetector):
+    def process_frame(self, frame):
+        time.sleep(0.05)
+        return frame, None
+
+
+class FakeBroadcaster(CameraBroadcaster):
+    def __init__(self, n_frames, **kwargs):
+        super().__init__(0, detector_factory=lambda cam: FakeDetector(), **kwargs)
+        self.n_frames = n_frames
+        self.go       = threading.Event()
+
+    def _open_capture(self):
+        self.go.wait(timeout=5)
+        self.cap = FakeCapture(self.n_frames)
+        return self.cap
+
+
+class FakePose:
+    def preprocess(self, frame):
+        return frame
+
+    def detect_rgb(self, rgb):
+        return self.detect(rgb)
+
+    def detect(self, frame):
+        poses = np.zeros((6, 56), dtype=np.float32)
+        poses[0, 2:51:3] = 1.0
+        poses[0, 1]      = frame.mean() / 255  # x of the first keypoint
+        poses[0, 55]     = 1.0
+        return poses
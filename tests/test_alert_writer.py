@@ -0,0 +1,52 @@
+# tests/test_alert_writer.py
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models import Alert
+from app.services.alert_writer import AlertWriter
+from app.services.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def test_alerts_are_written_in_batches(session_factory, tmp_path):
+    store  = SnapshotStore(str(tmp_path))
+    writer = AlertWriter(session_factory, max_queue=100, batch_size=4, interval=0.05,
+                         snapshots=store)
+    for i in range(10):
+        assert writer.enqueue(image=b"jpeg", camera_id=i % 2, score=0.9)
+    writer.stop()
+
+    stats = writer.stats()
+    assert stats["queued"] == stats["flushed"] == 10
+    assert stats["dropped"] == stats["failed"] == stats["pending"] == 0
+    assert 3 <= stats["batches"] < 10
+    with session_factory() as db:
+        alerts = db.query(Alert).all()
+    assert len(alerts) == 10
+    digests = {a.image_path.rsplit("/", 1)[1] for a in alerts}
+    assert len(digests) == 1  # identical frames are stored once
+    assert store.find(digests.pop())
+
+
+def test_full_queue_drops_instead_of_blocking(session_factory):
+    writer = AlertWriter(session_factory, max_queue=2, interval=60)
+    writer._ensure_running = lambda: None  # keep everything queued
+    results = [writer.enqueue(image_path=f"{i}.jpg") for i in range(3)]
+    assert results == [True, True, False]
+    assert writer.stats()["dropped"] == 1
+
+    writer.flush()
+    assert writer.stats()["flushed"] == 2
+    assert writer.stats()["batches"] == 1
@@ -0,0 +1,81 @@
+# tests/test_alerts.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.api.auth import get_current_active_user
+from app.db.models import Alert
+from app.db.session import DBSession, get_session
+from app.main import app
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        # 10 alerts; two share each timestamp so ties are broken by id
+        db.add_all(
+            Alert(
+                image_path=f"a{i}.jpg",
+                timestamp=T0 + timedelta(minutes=i // 2),
+                user_id=1 + i % 2,
+                camera_id=i % 3,
+            )
+            for i in range(10)
+        )
+        db.commit()
+
+    async def override():
+        db = DBSession(Session(), is_async=False)
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides[get_session] = override
+    app.dependency_overrides[get_current_active_user] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+
+
+def walk(client, **params):
+    ids, cursor = [], None
+    while True:
+        page = client.get("/alerts/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert page.status_code == 200
+        body = page.json()
+        ids += [a["id"] for a in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_pages_cover_everything_newest_first(client):
+    assert walk(client, limit=3) == list(range(10, 0, -1))
+
+
+def test_filters_combine_with_paging(client):
+    ids = walk(client, limit=2, camera_id=0, since=(T0 + timedelta(minutes=1)).isoformat())
+    # camera 0 holds ids 1, 4, 7, 10; id 1 is before `since`
+    assert ids == [10, 7, 4]
+    assert walk(client, limit=2, user_id=2, until=(T0 + timedelta(minutes=2)).isoformat()) == [4, 2]
+
+
+def test_limit_and_cursor_are_validated(client):
+    assert client.get("/alerts/", params={"limit": 0}).status_code == 422
+    assert client.get("/alerts/", params={"limit": 10_000}).status_code == 422
+    assert client.get("/alerts/", params={"cursor": "not-a-cursor"}).status_code == 400
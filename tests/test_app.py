@@ -5,7 +5,9 @@ from fastapi.testclient import TestClient
 
 # 0) Stub out the detector so background tasks don't load a real model
 from app.services.detector import ViolenceDetector
+from app.services.supervisor import CameraSupervisor
 ViolenceDetector.run = lambda self, *args, **kwargs: None
+CameraSupervisor.start_detection = lambda self, *args, **kwargs: None
 
 from app.main import app
 from app.api.auth import get_current_active_user, get_current_active_admin
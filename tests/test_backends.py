@@ -0,0 +1,27 @@
+# tests/test_backends.py
+
+import numpy as np
+import tensorflow as tf
+
+from app.services.backends import TFLiteClassifierBackend
+
+
+class TinyClassifier(tf.Module):
+    def __init__(self):
+        self.w = tf.Variable(tf.linspace(-1.0, 1.0, 8)[:, tf.newaxis])
+
+    @tf.function(input_signature=[tf.TensorSpec((1, 2, 4), tf.float32)])
+    def __call__(self, x):
+        return tf.sigmoid(tf.reshape(x, (1, 8)) @ self.w)
+
+
+def test_tflite_classifier_matches_tensorflow(tmp_path):
+    model = TinyClassifier()
+    tf.saved_model.save(model, str(tmp_path / "saved"))
+    flatbuffer = tf.lite.TFLiteConverter.from_saved_model(str(tmp_path / "saved")).convert()
+    (tmp_path / "model.tflite").write_bytes(flatbuffer)
+
+    backend = TFLiteClassifierBackend(str(tmp_path / "model.tflite"), num_threads=1)
+    seq = np.arange(8, dtype=np.float32).reshape(1, 2, 4) / 8
+    assert abs(backend(seq) - float(model(seq)[0, 0])) < 1e-5
+    assert backend.weight_bytes == len(flatbuffer)
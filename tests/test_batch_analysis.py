@@ -0,0 +1,169 @@
+# tests/test_batch_analysis.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from app.services import batch_analysis
+from app.services.batch_analysis import AnalysisJobs, score_windows, summarize
+from app.services.detector import ViolenceDetector
+
+from tests.fakes import FakePose
+
+
+class FakeClassifier:
+    def __init__(self, scale=100.0):
+        self.scale   = scale
+        self.batches = []
+
+    def predict_batch(self, seqs):
+        self.batches.append(len(seqs))
+        return seqs[:, -1, 0] / self.scale
+
+
+class FakeDetector:
+    seq_len, max_people, feat_dim = 2, 2, 68
+    warning_th, urgent_th = 0.5, 0.8
+    backend = "tf"
+
+    def __init__(self, saved=True):
+        self.pose       = FakePose()
+        self.classifier = FakeClassifier(scale=32.0)  # frame width
+        self.saved      = saved
+        self.trained    = False
+        self.loaded     = []
+
+    def load_model(self, model_path):
+        self.loaded.append(model_path)
+        self.trained = self.saved
+        return self.saved
+
+
+def write_clip(path, n_frames=10):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 5, (32, 24))
+    for i in range(n_frames):
+        writer.write(np.full((24, 32, 3), 255 if i >= 5 else 0, dtype=np.uint8))
+    writer.release()
+
+
+def test_read_chunks_keeps_only_model_inputs(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    write_clip(path)
+    shrink = lambda frame: cv2.resize(frame, (8, 8))
+    chunks = list(batch_analysis.read_chunks(path, shrink, chunk_frames=4, frame_stride=2))
+    assert [indices for _, _, indices in chunks] == [[0, 2, 4, 6], [8]]
+    inputs, sizes, _ = chunks[0]
+    assert all(rgb.shape == (8, 8, 3) for rgb in inputs)
+    assert sizes == [(24, 32)] * 4
+
+
+def test_score_windows_batches_and_skips_empty_frames():
+    feats = np.zeros((5, 4), dtype=np.float32)
+    feats[[1, 3, 4], 0] = [10, 30, 40]
+    clf = FakeClassifier()
+    scores = score_windows(clf, feats, seq_len=2)
+    np.testing.assert_allclose(scores, [0.1, 0.0, 0.3, 0.4])
+    assert clf.batches == [3]
+
+
+def test_summarize_flags_intervals():
+    idx    = np.arange(40)
+    scores = np.r_[np.full(10, 0.1), np.full(20, 0.9), np.full(10, 0.1)].astype(np.float32)
+    timeline, intervals = summarize(idx, scores, fps=10, warning_th=0.5, urgent_th=0.8)
+    assert [p["second"] for p in timeline] == [0, 1, 2, 3]
+    assert intervals == [{"start": 1, "end": 3, "peak": 0.9, "level": "urgent"}]
+
+
+def test_analyze_video_in_chunks(tmp_path, monkeypatch):
+    detector = FakeDetector()
+    monkeypatch.setattr(batch_analysis, "make_detector", lambda camera_index: detector)
+    path = str(tmp_path / "clip.avi")
+    write_clip(path)
+
+    result = batch_analysis.analyze_video(path, chunk_frames=4)
+    assert result["frames"] == 10
+    # one batched classifier call per chunk (4, 4, 2 frames), windows
+    # spanning chunk borders; only windows ending on frames 5-9 have a
+    # person in view, and the first chunk has none
+    assert detector.classifier.batches == [3, 2]
+    assert [p["second"] for p in result["timeline"]] == [0, 1]
+    assert result["intervals"][0]["start"] == 1
+    assert detector.loaded == [batch_analysis.settings.MODEL_PATH]
+
+
+def test_analyze_video_needs_a_trained_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_analysis, "make_detector", lambda camera_index: FakeDetector(saved=False))
+    path = str(tmp_path / "clip.avi")
+    write_clip(path)
+    with pytest.raises(RuntimeError, match="No trained model"):
+        batch_analysis.analyze_video(path)
+
+
+def test_worker_scores_with_the_stored_model(tmp_path, monkeypatch):
+    # a "trained" model that is confident everything is violent; an
+    # untrained transformer would hover around 0.5
+    stored = tf.keras.Sequential([
+        tf.keras.Input((3, 34)),
+        tf.keras.layers.GlobalAveragePooling1D(),
+        tf.keras.layers.Dense(1, activation="sigmoid", kernel_initializer="zeros",
+                              bias_initializer=tf.keras.initializers.Constant(5.0)),
+    ])
+    model_path = str(tmp_path / "model.keras")
+    stored.save(model_path)
+
+    class Detector(ViolenceDetector):
+        pose = FakePose()
+
+    detector = Detector(camera_index=None, seq_len=3, max_people=1, warning_th=0.5, urgent_th=0.9)
+    monkeypatch.setattr(batch_analysis, "make_detector", lambda camera_index: detector)
+    monkeypatch.setattr(batch_analysis.settings, "MODEL_PATH", model_path)
+    path = str(tmp_path / "clip.avi")
+    write_clip(path)
+
+    result = batch_analysis.analyze_video(path)
+    # dark first second: nobody in view, the classifier is skipped
+    assert [p["mean"] for p in result["timeline"]][0] == 0.0
+    assert result["timeline"][1]["mean"] > 0.99
+    assert result["intervals"][0]["level"] == "urgent"
+
+
+def test_jobs_report_status_and_errors():
+    def analyze(path):
+        if path == "bad.mp4":
+            raise ValueError("Cannot open video bad.mp4")
+        return {"file": path}
+
+    jobs = AnalysisJobs(executor_factory=lambda: ThreadPoolExecutor(2), analyze=analyze)
+    good = jobs.submit("good.mp4")
+    bad  = jobs.submit("bad.mp4")
+    jobs.executor.shutdown(wait=True)
+    assert jobs.get(good["id"])["status"] == "done"
+    assert jobs.get(bad["id"])["status"] == "failed"
+    assert "Cannot open" in jobs.get(bad["id"])["error"]
+    assert len(jobs.list()) == 2
+
+
+def test_jobs_delete_uploads_and_expire(tmp_path):
+    def analyze(path):
+        if path.endswith("bad.mp4"):
+            raise ValueError("Cannot open video")
+        return {"file": path}
+
+    jobs = AnalysisJobs(executor_factory=lambda: ThreadPoolExecutor(1), analyze=analyze, ttl=60)
+    kept = jobs.submit("kept.mp4")
+    uploads = []
+    for name in ("good.mp4", "bad.mp4"):
+        upload = str(tmp_path / name)
+        open(upload, "wb").close()
+        uploads.append(upload)
+        jobs.submit(upload, delete_file=True)
+    jobs.executor.shutdown(wait=True)
+    assert not any(os.path.exists(p) for p in uploads)  # done and failed alike
+
+    jobs._jobs[kept["id"]]["finished_at"] -= 120
+    assert kept["id"] not in {job["id"] for job in jobs.list()}
+    assert len(jobs.list()) == 2
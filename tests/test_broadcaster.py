@@ -0,0 +1,216 @@
+# tests/test_broadcaster.py
+
+import asyncio
+import time
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+from app.core.config import settings
+from app.services import broadcaster as broadcaster_module
+from app.services import detector as detector_module
+from app.services import supervisor as supervisor_module
+from app.services.broadcaster import AsyncSubscriber, Rendition, Subscriber, make_detector
+from app.services.model_registry import ModelRegistry
+
+from tests.fakes import FakeBroadcaster, SlowDetector
+
+
+def test_slow_subscriber_drops_oldest():
+    sub = Subscriber(maxsize=2)
+    for chunk in (b"a", b"b", b"c"):
+        sub.push(chunk)
+    assert sub.dropped == 1
+    assert sub.get(timeout=0) == b"b"
+    assert sub.get(timeout=0) == b"c"
+
+
+def test_frames_fan_out_to_every_viewer():
+    bc = FakeBroadcaster(n_frames=3, buffer_size=10)
+    subs = [bc.subscribe(), bc.subscribe()]
+    bc.go.set()
+    bodies = [b"".join(bc.stream(s)) for s in subs]
+    assert bodies[0] == bodies[1]
+    # the capture thread keeps only the newest frame, so some may be skipped
+    assert 1 <= bodies[0].count(b"--frame") == bc.frames <= 3
+    assert not bc.running
+
+
+def test_async_subscriber_keeps_latest_frame():
+    async def main():
+        sub = AsyncSubscriber(asyncio.get_running_loop())
+        for chunk in (b"a", b"b", b"c"):
+            sub.push(chunk)
+        await asyncio.sleep(0)
+        return sub, await sub.get_async()
+
+    sub, chunk = asyncio.run(main())
+    assert chunk == b"c"
+    assert sub.dropped == 2
+
+
+def test_async_disconnect_releases_camera():
+    bc = FakeBroadcaster(n_frames=-1)  # never runs out
+
+    async def main():
+        stream = bc.stream_async(bc.subscribe_async())
+        bc.go.set()
+        first = await asyncio.wait_for(stream.__anext__(), timeout=5)
+        await stream.aclose()  # what a client disconnect does to the response
+        return first
+
+    assert asyncio.run(main()).startswith(b"--frame")
+    bc._thread.join(timeout=5)
+    assert not bc.running
+    assert bc.status()["viewers"] == 0
+    assert bc.cap.released
+
+
+def test_quick_reconnect_keeps_streaming():
+    bc = FakeBroadcaster(n_frames=-1)
+    bc.detector_factory = lambda cam: SlowDetector()
+    first = bc.subscribe()
+    bc.go.set()
+    assert first.get(timeout=5) is not None
+    bc.unsubscribe(first)
+    # the old run is still busy with its frame when the viewer comes back
+    assert bc.running
+    second = bc.subscribe()
+    chunks = [second.get(timeout=5) for _ in range(3)]
+    assert all(c is not None and c.startswith(b"--frame") for c in chunks)
+    assert bc.running
+    bc.unsubscribe(second)
+    bc._thread.join(timeout=5)
+    assert not bc.running
+
+
+def test_renditions_encoded_once_and_shared():
+    bc = FakeBroadcaster(n_frames=0)
+    small, full = Rendition(width=32, quality=50), Rendition()
+    subs = [Subscriber(4, small), Subscriber(4, small), Subscriber(4, full)]
+    bc._subscribers.update(subs)
+
+    bc._publish_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+    chunks = [s.get(timeout=0) for s in subs]
+    assert chunks[0] is chunks[1]
+    assert bc.encode_stats[small].frames == bc.encode_stats[full].frames == 1
+
+    jpeg = chunks[0].split(b"\r\n\r\n", 1)[1][:-2]
+    img  = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert img.shape[:2] == (24, 32)
+    assert bc.status()["renditions"]["32@q50"]["frames"] == 1
+
+    # stats go away with the last viewer of a rendition
+    bc._subscribers.difference_update(subs[:2])
+    bc._publish_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+    assert list(bc.status()["renditions"]) == [full.label]
+
+
+def test_max_fps_thins_frames_per_viewer():
+    sub = Subscriber(4, max_fps=5)
+    # a 15 fps camera for one second
+    due = sum(sub.due(i / 15) for i in range(15))
+    assert due == 5
+    assert Subscriber(4).due(0.0) and Subscriber(4).due(0.0)
+
+
+def test_urgent_level_queues_one_alert_per_cooldown(monkeypatch):
+    queued = []
+
+    class Writer:
+        def enqueue(self, **alert):
+            queued.append(alert)
+
+    class Detector:
+        level, smoothed, trained = "urgent", 0.93, True
+
+    monkeypatch.setattr(broadcaster_module, "alert_writer", Writer())
+    bc = FakeBroadcaster(n_frames=0)
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    bc._maybe_alert(Detector(), frame, None)  # skipped frame, level not refreshed
+    assert queued == []
+    bc._maybe_alert(Detector(), frame, 0.95)
+    bc._maybe_alert(Detector(), frame, 0.95)  # still cooling down
+    assert len(queued) == 1
+    assert queued[0]["camera_id"] == 0 and queued[0]["score"] == 0.93
+    assert queued[0]["image"].startswith(b"\xff\xd8")  # JPEG
+
+
+def test_untrained_model_never_alerts(tmp_path, monkeypatch):
+    queued = []
+
+    class Writer:
+        def enqueue(self, **alert):
+            queued.append(alert)
+
+    monkeypatch.setattr(broadcaster_module, "alert_writer", Writer())
+    monkeypatch.setattr(detector_module, "registry", ModelRegistry())
+    monkeypatch.setattr(settings, "MODEL_PATH", str(tmp_path / "missing.keras"))
+    detector = make_detector(0)
+    detector.level, detector.smoothed = "urgent", 0.97  # noise from random weights
+    bc = FakeBroadcaster(n_frames=0)
+    bc._maybe_alert(detector, np.zeros((48, 64, 3), dtype=np.uint8), 0.97)
+    assert not detector.trained and queued == []
+
+
+def test_live_detector_loads_the_saved_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(detector_module, "registry", ModelRegistry())
+    monkeypatch.setattr(settings, "MODEL_PATH", str(tmp_path / "missing.keras"))
+    assert not make_detector(0).trained
+
+    feat_dim = settings.MAX_PEOPLE * 34
+    stored = tf.keras.Sequential([
+        tf.keras.Input((settings.SEQ_LEN, feat_dim)),
+        tf.keras.layers.GlobalAveragePooling1D(),
+        tf.keras.layers.Dense(1, activation="sigmoid"),
+    ])
+    model_path = str(tmp_path / "model.keras")
+    stored.save(model_path)
+    monkeypatch.setattr(settings, "MODEL_PATH", model_path)
+
+    detector = make_detector(0)
+    assert detector.trained
+    loaded = detector.model
+    assert make_detector(1).model is loaded  # loaded once, shared by every camera
+
+
+def test_supervisor_restarts_stalled_camera(monkeypatch):
+    bc = FakeBroadcaster(n_frames=0)
+    bc.go.set()
+    monkeypatch.setattr(supervisor_module, "get_broadcaster", lambda cam: bc)
+
+    sup = supervisor_module.CameraSupervisor([0], stall_seconds=60)
+    bc.start()
+    bc._thread.join(timeout=5)
+    sup.check()
+    assert bc.restarts == 1
+    assert bc.status()["pinned"]
+    sup.stop()
+
+
+def test_restart_opens_camera_after_old_run_released_it():
+    opened_while_old_alive = []
+
+    class Broadcaster(FakeBroadcaster):
+        def _open_capture(self):
+            if old is not None:
+                opened_while_old_alive.append(old.is_alive())
+            return super()._open_capture()
+
+    old = None
+    bc = Broadcaster(n_frames=-1)
+    bc.detector_factory = lambda cam: SlowDetector()
+    bc.start()
+    bc.go.set()
+    deadline = time.monotonic() + 5
+    while bc.frames == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    old = bc._thread
+    bc.restart()  # the old run is mid-frame
+    deadline = time.monotonic() + 5
+    while not opened_while_old_alive and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert opened_while_old_alive == [False]
+    bc.stop()
+    bc._thread.join(timeout=5)
@@ -0,0 +1,45 @@
+# tests/test_db_session.py
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.db.base import Base
+from app.db.models import Alert
+from app.db.session import DBSession, async_url, engine_options, tune_sqlite
+
+
+def test_sqlite_connections_are_tuned(tmp_path):
+    url = f"sqlite:///{tmp_path / 'db.sqlite'}"
+    engine = create_engine(url, **engine_options(url))
+    tune_sqlite(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    assert engine.pool.size() == engine_options(url)["pool_size"]
+
+
+def test_async_url_picks_driver():
+    assert async_url("sqlite:///./violence_db.sqlite") == "sqlite+aiosqlite:///./violence_db.sqlite"
+    assert async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+
+def test_async_session_path(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        db = DBSession(async_sessionmaker(engine, expire_on_commit=False)(), is_async=True)
+        db.add(Alert(image_path="a.jpg", camera_id=3))
+        await db.commit()
+        alert = await db.scalar(select(Alert).where(Alert.camera_id == 3))
+        await db.close()
+        await engine.dispose()
+        return alert
+
+    assert asyncio.run(main()).image_path == "a.jpg"
@@ -99,3 +99,19 @@ def test_start_detection(admin_token):
     headers = {"Authorization": f"Bearer {admin_token}"}
     r = client.post("/start-detection", headers=headers)
     assert r.status_code == 200
+
+
+def test_debug_models():
+    r = client.get("/debug/models")
+    assert r.status_code == 200
+    assert isinstance(r.json(), list)
+
+
+def test_video_feed_rejects_tiny_width():
+    r = client.get("/video_feed", params={"width": 8})
+    assert r.status_code == 422
+
+
+def test_video_feed_unknown_camera():
+    r = client.get("/video_feed/999")
+    assert r.status_code == 404
@@ -0,0 +1,52 @@
+# tests/test_extraction.py
+
+import cv2
+import numpy as np
+
+from app.services.extraction import ParallelExtractor
+from app.services.feature_store import FeatureStore
+
+
+class FakePose:
+    input_size = 32
+
+    def __init__(self):
+        self.calls = 0
+
+    def preprocess(self, img):
+        return cv2.resize(img, (self.input_size, self.input_size))
+
+    def detect_rgb(self, rgb):
+        self.calls += 1
+        poses = np.zeros((6, 56), dtype=np.float32)
+        poses[0, 0:51:3] = rgb.mean() / 255  # y
+        poses[0, 2:51:3] = 1.0               # keypoint scores
+        poses[0, 55]     = 1.0
+        return poses
+
+
+def test_extracts_misses_in_parallel_and_caches(tmp_path):
+    paths = []
+    for i in range(10):
+        p = tmp_path / f"{i}.png"
+        cv2.imwrite(str(p), np.full((40, 50, 3), i * 20, dtype=np.uint8))
+        paths.append(str(p))
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    paths.append(str(broken))
+
+    store = FeatureStore(str(tmp_path / "store"), feat_dim=68)
+    pose  = FakePose()
+    extractor = ParallelExtractor(pose, max_people=2, decode_workers=3, pose_workers=2, batch_size=4)
+
+    rows, stats = extractor.run(paths, store)
+    assert stats.extracted == 10 and stats.failed == 1 and stats.cached == 0
+    assert rows[-1] is None
+    X = store.take(rows[:-1])
+    # y keypoint of person 0 scaled by the original height (40)
+    np.testing.assert_allclose(X[:, 1], [i * 20 / 255 * 40 for i in range(10)], rtol=1e-3)
+
+    rows_again, stats = extractor.run(paths[:-1], store)
+    assert stats.cached == 10 and stats.extracted == 0
+    assert rows_again == rows[:-1]
+    assert pose.calls == 10
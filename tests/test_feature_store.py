@@ -0,0 +1,47 @@
+# tests/test_feature_store.py
+
+import os
+
+import numpy as np
+
+from app.services.feature_store import FeatureStore
+
+
+def test_cached_rows_survive_reopen(tmp_path):
+    img = tmp_path / "a.jpg"
+    img.write_bytes(b"pixels")
+    store = FeatureStore(str(tmp_path / "store"), feat_dim=4)
+    row = store.add(str(img), np.arange(4))
+    store.flush()
+
+    reopened = FeatureStore(str(tmp_path / "store"), feat_dim=4)
+    assert reopened.lookup(str(img)) == row
+    np.testing.assert_array_equal(reopened.matrix()[row], [0, 1, 2, 3])
+
+
+def test_changed_content_is_a_miss(tmp_path):
+    img = tmp_path / "a.jpg"
+    img.write_bytes(b"pixels")
+    store = FeatureStore(str(tmp_path / "store"), feat_dim=2)
+    store.add(str(img), np.zeros(2))
+
+    img.write_bytes(b"other pixels")
+    assert store.lookup(str(img)) is None
+
+    # touching a file without changing it is still a hit
+    img2 = tmp_path / "b.jpg"
+    img2.write_bytes(b"same")
+    store.add(str(img2), np.ones(2))
+    os.utime(img2, ns=(0, 0))
+    assert store.lookup(str(img2)) is not None
+
+
+def test_contiguous_rows_are_memory_mapped(tmp_path):
+    store = FeatureStore(str(tmp_path / "store"), feat_dim=3)
+    for i in range(3):
+        p = tmp_path / f"{i}.jpg"
+        p.write_bytes(bytes([i]))
+        store.add(str(p), np.full(3, i))
+    X = store.take([0, 1, 2])
+    assert isinstance(X, np.memmap)
+    np.testing.assert_array_equal(store.take([2, 0])[:, 0], [2, 0])
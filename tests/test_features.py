@@ -0,0 +1,54 @@
+# tests/test_features.py
+
+import numpy as np
+
+from app.services.features import poses_to_features
+
+
+def reference_features(poses, orig_size):
+    h, w = orig_size
+    feats = []
+    for p in poses:
+        for y, x, s in p[:51].reshape(17, 3):
+            feats += [0.0, 0.0] if s < 0.2 else [x * w, y * h]
+    return np.array(feats, dtype=np.float32)
+
+
+def make_poses(rng, n=6):
+    poses = rng.random((n, 56), dtype=np.float32)
+    # MoveNet-style: rows ordered by person score
+    return poses[np.argsort(-poses[:, 55])]
+
+
+def test_matches_reference_for_one_frame():
+    rng   = np.random.default_rng(1)
+    poses = make_poses(rng)
+    feats = poses_to_features(poses, (480, 640), max_people=2)
+    np.testing.assert_allclose(feats, reference_features(poses[:2], (480, 640)), rtol=1e-6)
+
+
+def test_selects_highest_scoring_people():
+    rng   = np.random.default_rng(2)
+    poses = make_poses(rng)[::-1].copy()  # lowest score first
+    feats = poses_to_features(poses, (100, 100), max_people=2)
+    expected = reference_features(poses[[5, 4]], (100, 100))
+    np.testing.assert_allclose(feats, expected, rtol=1e-6)
+
+
+def test_batch_writes_into_caller_buffer():
+    rng   = np.random.default_rng(3)
+    batch = np.stack([make_poses(rng) for _ in range(4)])
+    sizes = np.array([[480, 640], [720, 1280], [240, 320], [100, 100]])
+    out   = np.full((4, 3 * 34), -1.0, dtype=np.float32)
+
+    result = poses_to_features(batch, sizes, max_people=3, out=out)
+    assert result is out
+    for i in range(4):
+        np.testing.assert_allclose(out[i], reference_features(batch[i][:3], sizes[i]), rtol=1e-6)
+
+
+def test_missing_people_are_zero_filled():
+    rng   = np.random.default_rng(4)
+    feats = poses_to_features(make_poses(rng, n=1), (10, 10), max_people=2)
+    assert feats.shape == (68,)
+    assert not feats[34:].any()
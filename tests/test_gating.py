@@ -0,0 +1,36 @@
+# tests/test_gating.py
+
+import numpy as np
+
+from app.services.gating import InferenceGate
+
+
+def frame(value):
+    return np.full((120, 160, 3), value, dtype=np.uint8)
+
+
+def test_static_scene_is_skipped_after_keepalive():
+    gate = InferenceGate(enabled=True, keepalive=2, refresh=0)
+    decisions = [gate.motion(frame(0)) for _ in range(5)]
+    assert decisions == [True, True, True, False, False]
+    assert gate.stats()["motion_skips"] == 2
+
+
+def test_gated_scene_is_refreshed_periodically():
+    gate = InferenceGate(enabled=True, keepalive=0, refresh=3)
+    decisions = [gate.motion(frame(0)) for _ in range(7)]
+    assert decisions == [True, False, False, True, False, False, True]
+
+
+def test_motion_reopens_the_gate():
+    gate = InferenceGate(enabled=True, keepalive=0)
+    gate.motion(frame(0))
+    assert not gate.motion(frame(0))
+    assert gate.motion(frame(200))
+
+
+def test_presence_counts_empty_features():
+    gate = InferenceGate()
+    assert not gate.present(np.zeros(68, dtype=np.float32))
+    assert gate.present(np.ones(68, dtype=np.float32))
+    assert gate.stats()["presence_skip_ratio"] == 0.5
@@ -0,0 +1,30 @@
+# tests/test_governor.py
+
+from app.services.governor import QualityGovernor, build_levels
+
+
+def test_levels_respect_floors_and_ceilings():
+    levels = build_levels(min_size=160, max_size=256, min_stride=1, max_stride=3)
+    assert levels[0] == (1, 256)
+    assert levels[-1] == (3, 160)
+    assert all(size % 32 == 0 and 160 <= size <= 256 for _, size in levels)
+
+
+def test_degrades_when_over_budget_and_recovers():
+    gov = QualityGovernor(budget_ms=10, max_stride=4, cooldown=0, alpha=1.0, enabled=True)
+    for _ in range(100):
+        gov.record(0.050)
+    assert gov.level == len(gov.levels) - 1
+    assert gov.stride == 4 and gov.input_size == 160
+
+    for _ in range(100):
+        gov.record(0.001)
+    assert gov.level == 0
+
+
+def test_disabled_governor_never_changes_level():
+    gov = QualityGovernor(budget_ms=1, cooldown=0, enabled=False)
+    for _ in range(10):
+        gov.record(1.0)
+    assert gov.level == 0
+    assert gov.status()["avg_ms"] > 0
@@ -0,0 +1,64 @@
+# tests/test_hashing.py
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.auth import authenticate_user
+from app.db.base import Base
+from app.db.models import User, UserRole
+from app.db.session import DBSession
+from app.services import hashing
+from app.services.hashing import HashExecutor, HashingOverloaded, make_context
+
+
+def test_executor_rejects_beyond_queue():
+    pool    = HashExecutor(workers=1, queue_size=1)
+    release = threading.Event()
+    running = [pool.submit(release.wait, 5) for _ in range(2)]  # 1 running + 1 queued
+    with pytest.raises(HashingOverloaded) as exc:
+        pool.submit(release.wait, 5)
+    assert exc.value.status_code == 503
+    assert "Retry-After" in exc.value.headers
+
+    release.set()
+    for future in running:
+        future.result(timeout=5)
+    pool.submit(len, "ok").result(timeout=5)  # capacity is back
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["completed"] == 3
+    pool.shutdown()
+
+
+def test_login_rehashes_outdated_parameters(monkeypatch):
+    old_ctx = make_context(time_cost=1, memory_cost=1024, parallelism=1)
+    new_ctx = make_context(time_cost=2, memory_cost=2048, parallelism=1)
+    monkeypatch.setattr(hashing, "pwd_context", new_ctx)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(User(id=1, email="a@test.com", password_hash=old_ctx.hash("pw"),
+                    role=UserRole.user, is_active=True))
+        db.commit()
+
+    async def login(password):
+        db = DBSession(Session(), is_async=False)
+        try:
+            return await authenticate_user(db, "a@test.com", password)
+        finally:
+            await db.close()
+
+    assert asyncio.run(login("wrong")) is None
+    assert asyncio.run(login("pw")) is not None
+    with Session() as db:
+        stored = db.get(User, 1).password_hash
+    assert not new_ctx.needs_update(stored)
+    assert new_ctx.verify("pw", stored)
@@ -0,0 +1,61 @@
+# tests/test_metrics.py
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.metrics import STAGE_SECONDS, MetricsRegistry, StageTimer
+
+from tests.fakes import FakeBroadcaster
+
+client = TestClient(app)
+
+
+def test_render_text_format():
+    reg = MetricsRegistry()
+    hist = reg.histogram("lat_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        hist.labels("pose").observe(value)
+    reg.counter("hits_total", "Hits.", ("path",)).labels('a"b').inc(2)
+    reg.collector(lambda: [("depth", "gauge", "Depth.", [("", {}, 3)])])
+
+    lines = reg.render().splitlines()
+    assert "# TYPE lat_seconds histogram" in lines
+    assert 'lat_seconds_bucket{stage="pose",le="0.1"} 1' in lines
+    assert 'lat_seconds_bucket{stage="pose",le="1"} 2' in lines
+    assert 'lat_seconds_bucket{stage="pose",le="+Inf"} 3' in lines
+    assert 'lat_seconds_count{stage="pose"} 3' in lines
+    assert 'hits_total{path="a\\"b"} 2' in lines
+    assert "depth 3" in lines
+
+
+def test_stage_timer_shares_series():
+    before = STAGE_SECONDS.labels("metrics-test", "pose").counts[:]
+    StageTimer("metrics-test").observe("pose", 0.002)
+    StageTimer("metrics-test").observe("pose", 0.002)
+    assert sum(STAGE_SECONDS.labels("metrics-test", "pose").counts) == sum(before) + 2
+
+
+def test_broadcaster_times_capture_and_encode():
+    def count(stage):
+        return sum(STAGE_SECONDS.labels("0", stage).counts)
+
+    capture, encode = count("capture"), count("encode")
+    bc = FakeBroadcaster(n_frames=3, buffer_size=10)
+    sub = bc.subscribe()
+    bc.go.set()
+    b"".join(bc.stream(sub))
+    assert count("capture") - capture >= 3
+    assert count("encode") - encode == bc.frames
+    assert bc.frames + bc.dropped_frames == 3
+
+
+def test_metrics_endpoint_counts_requests():
+    client.get("/healthz")
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = res.text
+    assert 'http_requests_total{method="GET",route="/healthz",status="200"}' in body
+    assert "# TYPE violence_stage_seconds histogram" in body
+    assert "violence_alerts_queued_total" in body
+    assert "# TYPE violence_camera_fps gauge" in body
@@ -0,0 +1,49 @@
+# tests/test_model_registry.py
+
+import tensorflow as tf
+
+from app.services.detector import MoveNetMultiPose
+from app.services.model_registry import ModelRegistry
+
+
+def test_loader_runs_once_per_key():
+    reg = ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return object()
+
+    first  = reg.get("pose", loader)
+    second = reg.get("pose", loader)
+    assert first is second
+    assert len(calls) == 1
+    assert [s["key"] for s in reg.stats()] == ["pose"]
+
+
+def test_put_replaces_shared_instance():
+    reg = ModelRegistry()
+    reg.get("clf", lambda: "untrained")
+    reg.put("clf", "trained", load_seconds=1.5)
+    assert reg.get("clf", lambda: "unused") == "trained"
+    assert reg.stats()[0]["load_seconds"] == 1.5
+
+
+def test_clear_drops_models_and_key_locks():
+    reg = ModelRegistry()
+    for key in ("pose", "classifier"):
+        reg.get(key, object)
+    reg.clear()
+    assert "pose" not in reg
+    assert reg.stats() == [] and reg._key_locks == {}
+
+
+def test_movenet_wrapper_reports_its_weights():
+    saved = tf.Module()
+    saved.kernel = tf.Variable(tf.zeros((4, 8)))
+    pose = MoveNetMultiPose.__new__(MoveNetMultiPose)
+    pose.model, pose.backend = saved, None
+
+    reg = ModelRegistry()
+    reg.put(("movenet", "tf"), pose)
+    assert reg.stats()[0]["weight_bytes"] == 4 * 8 * 4
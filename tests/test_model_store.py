@@ -0,0 +1,33 @@
+# tests/test_model_store.py
+
+import pytest
+
+from app.services.model_store import (
+    CHECKSUM_FILE, ModelStoreError, directory_digest, load_movenet, verify,
+)
+
+
+@pytest.fixture
+def saved_model_dir(tmp_path):
+    (tmp_path / "variables").mkdir()
+    (tmp_path / "saved_model.pb").write_bytes(b"graph")
+    (tmp_path / "variables" / "variables.index").write_bytes(b"index")
+    return tmp_path
+
+
+def test_verify_accepts_matching_manifest(saved_model_dir):
+    digest = directory_digest(str(saved_model_dir))
+    (saved_model_dir / CHECKSUM_FILE).write_text(f"{digest}  movenet\n")
+    assert verify(str(saved_model_dir)) == digest
+
+
+def test_verify_rejects_modified_model(saved_model_dir):
+    digest = directory_digest(str(saved_model_dir))
+    (saved_model_dir / "saved_model.pb").write_bytes(b"tampered")
+    with pytest.raises(ModelStoreError):
+        verify(str(saved_model_dir), expected=digest)
+
+
+def test_missing_store_without_download_fails(tmp_path):
+    with pytest.raises(ModelStoreError):
+        load_movenet(str(tmp_path / "absent"), allow_download=False)
@@ -0,0 +1,84 @@
+# tests/test_profiler.py
+
+import io
+import json
+import time
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.auth import get_current_active_admin
+from app.services.profiler import Profiler, ProfilerBusy, top_functions
+
+from tests.fakes import FakeBroadcaster, SlowDetector
+
+
+@pytest.fixture
+def running():
+    bc = FakeBroadcaster(n_frames=-1)  # never runs out
+    bc.detector_factory = lambda cam: SlowDetector()
+    bc.start()
+    bc.go.set()
+    deadline = time.monotonic() + 5
+    while bc.frames == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield bc
+    bc.stop()
+    bc._thread.join(timeout=5)
+
+
+def test_capture_samples_camera_threads(running):
+    artifact = Profiler().capture(running, seconds=0.3, interval=0.005)
+    with zipfile.ZipFile(io.BytesIO(artifact)) as zf:
+        names   = zf.namelist()
+        summary = json.loads(zf.read("summary.json"))
+        stacks  = zf.read("stacks.folded").decode().splitlines()
+    assert names == ["stacks.folded", "summary.json"]
+    assert summary["camera"] == 0 and not summary["tf_trace"]
+    assert set(summary["threads"]) == {"camera-0", "camera-0-capture"}
+    assert summary["samples"] > 0 and summary["frames"] > 0
+    assert all(line.startswith("camera-0") for line in stacks)
+    assert any("fakes.py:process_frame" in line for line in stacks)
+
+
+def test_capture_includes_tf_trace(running):
+    artifact = Profiler().capture(running, seconds=0.2, trace=True)
+    with zipfile.ZipFile(io.BytesIO(artifact)) as zf:
+        summary = json.loads(zf.read("summary.json"))
+        traces  = [n for n in zf.namelist() if n.startswith("tf/")]
+    assert summary["tf_trace"] and traces
+    assert "MoveNet" in summary["tf_trace_note"]
+
+
+def test_tflite_trace_is_labelled(running):
+    running.detector.backend = "tflite"
+    artifact = Profiler().capture(running, seconds=0.1, trace=True)
+    with zipfile.ZipFile(io.BytesIO(artifact)) as zf:
+        summary = json.loads(zf.read("summary.json"))
+    assert "no pose" in summary["tf_trace_note"]
+
+
+def test_one_profile_at_a_time(running):
+    profiler = Profiler()
+    profiler._lock.acquire()
+    with pytest.raises(ProfilerBusy):
+        profiler.capture(running, seconds=0.1)
+
+
+def test_top_functions():
+    stacks = {"t;a;b": 3, "t;a;c": 1, "t;a": 1}
+    top = {row["function"]: (row["self"], row["total"]) for row in top_functions(stacks)}
+    assert top == {"b": (3, 3), "c": (1, 1), "a": (1, 5)}
+
+
+def test_endpoint_requires_running_camera():
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides[get_current_active_admin] = lambda: None
+    try:
+        res = TestClient(app).post("/debug/profile/99", params={"seconds": 0.1})
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+    assert res.status_code == 409
@@ -0,0 +1,75 @@
+# tests/test_snapshots.py
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import snapshots as snapshots_api
+from app.api.auth import get_current_active_user
+from app.main import app
+from app.services.snapshot_store import SnapshotStore
+
+
+def jpeg(width=640, height=480):
+    img = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode(".jpg", img)[1].tobytes()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path), thumb_width=160)
+    monkeypatch.setattr(snapshots_api, "snapshot_store", store)
+    return store
+
+
+@pytest.fixture
+def logged_in():
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides[get_current_active_user] = lambda: None
+    yield
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(saved)
+
+
+def test_put_is_content_addressed_with_thumbnail(store):
+    data   = jpeg()
+    digest = store.put(data)
+    assert store.put(data) == digest
+    with open(store.find(digest), "rb") as fh:
+        assert fh.read() == data
+    thumb = cv2.imread(store.find(digest, thumb=True))
+    assert thumb.shape[:2] == (120, 160)
+    assert store.find("../../etc/passwd") is None
+
+
+def test_snapshot_endpoint_caching_and_ranges(store, logged_in):
+    data   = jpeg()
+    digest = store.put(data)
+    client = TestClient(app)
+
+    r = client.get(f"/snapshots/{digest}")
+    assert r.status_code == 200 and r.content == data
+    assert r.headers["etag"] == f'"{digest}"'
+    assert "immutable" in r.headers["cache-control"]
+
+    r = client.get(f"/snapshots/{digest}", headers={"If-None-Match": f'"{digest}"'})
+    assert r.status_code == 304
+
+    r = client.get(f"/snapshots/{digest}", headers={"Range": "bytes=0-99"})
+    assert r.status_code == 206 and r.content == data[:100]
+
+    r = client.get(f"/snapshots/{digest}/thumb")
+    assert r.status_code == 200 and len(r.content) < len(data)
+    assert client.get(f"/snapshots/{'0' * 64}").status_code == 404
+
+
+def test_snapshots_require_login(store):
+    digest = store.put(jpeg())
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides.pop(get_current_active_user, None)
+    try:
+        res = TestClient(app).get(f"/snapshots/{digest}")
+    finally:
+        app.dependency_overrides.update(saved)
+    assert res.status_code == 401
@@ -0,0 +1,42 @@
+# tests/test_training.py
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.training import extract_clip, window_dataset
+
+from tests.fakes import FakePose
+
+
+def test_extract_clip_reads_every_strided_frame(tmp_path):
+    path   = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    for i in range(6):
+        writer.write(np.full((24, 32, 3), i * 40, dtype=np.uint8))
+    writer.release()
+
+    feats = extract_clip(FakePose(), path, max_people=2, frame_stride=2)
+    assert feats.shape == (3, 68)
+    assert feats[0, 0] < feats[1, 0] < feats[2, 0]
+
+
+def test_window_dataset_streams_sliding_windows(tmp_path):
+    clips = []
+    for label, n_frames in ((0, 5), (1, 3), (1, 1)):
+        npy = str(tmp_path / f"{label}-{n_frames}.npy")
+        np.save(npy, np.arange(n_frames * 4, dtype=np.float32).reshape(n_frames, 4))
+        clips.append((npy, label))
+
+    ds = window_dataset(clips, seq_len=2, feat_dim=4, window_stride=1,
+                        batch_size=3, shuffle_buffer=8, cache_path="")
+    X, y = zip(*[(x.numpy(), l.numpy()) for x, l in ds])
+    X, y = np.concatenate(X), np.concatenate(y)
+    # 4 windows from the 5-frame clip, 2 from the 3-frame one, none from the 1-frame clip
+    assert X.shape == (6, 2, 4)
+    assert sorted(y.tolist()) == [0, 0, 0, 0, 1, 1]
+
+
+def test_window_dataset_without_clips_fails_clearly():
+    with pytest.raises(ValueError, match="No training clips"):
+        window_dataset([], seq_len=2, feat_dim=4)
@@ -0,0 +1,102 @@
+# tests/test_user_cache.py
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from jose import jwt
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.auth import get_current_user
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import User, UserRole
+from app.db.session import DBSession
+from app.services.user_cache import UserCache, user_cache
+
+
+def make_user(user_id, **kw):
+    return User(id=user_id, email=f"u{user_id}@test.com", password_hash="x",
+                role=kw.get("role", UserRole.user), is_active=True)
+
+
+def test_lru_and_ttl():
+    cache = UserCache(max_size=2, ttl=0.2)
+    for i in (1, 2):
+        cache.put(make_user(i))
+    assert cache.get(1).email == "u1@test.com"   # 1 is now most recent
+    cache.put(make_user(3))                      # evicts 2
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+    time.sleep(0.25)
+    assert cache.get(1) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+
+@pytest.fixture
+def Session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(make_user(1))
+        db.commit()
+    user_cache.clear()
+    yield Session
+    user_cache.clear()
+
+
+def lookup(Session, user_id=1):
+    token = jwt.encode(
+        {"sub": str(user_id), "role": "user", "exp": datetime.utcnow() + timedelta(minutes=5)},
+        settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM,
+    )
+
+    async def run():
+        db = DBSession(Session(), is_async=False)
+        try:
+            user = await get_current_user(token, db)
+            return user.email, user.role, user.is_active
+        finally:
+            await db.close()
+
+    return asyncio.run(run())
+
+
+def test_lookups_hit_the_cache(Session):
+    before = user_cache.stats()
+    assert lookup(Session) == lookup(Session) == ("u1@test.com", UserRole.user, True)
+    after = user_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+@pytest.mark.parametrize("field, value", [
+    ("is_active", False),
+    ("role", UserRole.admin),
+    ("password_hash", "new-hash"),   # what reset_password changes
+])
+def test_auth_changes_invalidate(Session, field, value):
+    lookup(Session)
+    with Session() as db:
+        user = db.get(User, 1)
+        setattr(user, field, value)
+        db.commit()
+    assert user_cache.get(1) is None
+    _, role, is_active = lookup(Session)  # re-read from the DB
+    if field != "password_hash":
+        assert {"role": role, "is_active": is_active}[field] == value
+
+
+def test_unrelated_changes_keep_the_entry(Session):
+    lookup(Session)
+    with Session() as db:
+        db.get(User, 1).twofa_secret = "abc"
+        db.commit()
+    assert user_cache.get(1) is not None
@@ -0,0 +1,81 @@
+# tests/test_websockets.py
+
+import json
+import math
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.websockets import scores as scores_module
+from app.websockets.scores import HEADER, encode_binary, encode_json, top_people
+
+from tests.fakes import FakeBroadcaster, FakeDetector
+
+
+def make_poses():
+    poses = np.zeros((6, 56), dtype=np.float32)
+    poses[0, :51] = np.tile([0.25, 0.5, 0.9], 17)  # (y, x, s)
+    poses[0, 55]  = 0.8
+    poses[1, 55]  = 0.05                          # below the person threshold
+    return poses
+
+
+def make_event(**overrides):
+    event = {
+        "camera": 0, "frame": 7, "ts": 1.5, "score": None,
+        "smoothed": 0.61234, "level": "warning", "poses": make_poses(),
+    }
+    event.update(overrides)
+    return event
+
+
+def test_top_people_drops_unconfident_and_swaps_axes():
+    people = top_people(make_poses(), max_people=2, min_score=0.2)
+    assert people.shape == (1, 17, 3)
+    assert people[0, 0].tolist() == [0.5, 0.25, np.float32(0.9)]
+
+
+def test_encode_json_keypoints_are_optional():
+    msg = json.loads(encode_json(make_event(), keypoints=False))
+    assert msg == {
+        "camera": 0, "frame": 7, "ts": 1.5, "score": None,
+        "smoothed": 0.6123, "level": "warning",
+    }
+    msg = json.loads(encode_json(make_event(), keypoints=True))
+    assert len(msg["keypoints"]) == 1 and len(msg["keypoints"][0]) == 17
+
+
+def test_encode_binary_layout():
+    data = encode_binary(make_event(), keypoints=True)
+    version, cam, frame, ts, score, smoothed, level, people = HEADER.unpack_from(data)
+    assert (version, cam, frame, level, people) == (1, 0, 7, 2, 1)
+    assert math.isnan(score)
+    kpts = np.frombuffer(data, "<f4", offset=HEADER.size).reshape(people, 17, 3)
+    assert kpts[0, 0, 0] == 0.5
+
+
+class ScoringDetector(FakeDetector):
+    level, smoothed = "normal", 0.1
+
+    def __init__(self):
+        self.poses = make_poses()
+
+    def process_frame(self, frame):
+        return frame, 0.1
+
+
+def test_scores_websocket_streams_until_pipeline_stops(monkeypatch):
+    bc = FakeBroadcaster(n_frames=3)
+    bc.detector_factory = lambda cam: ScoringDetector()
+    monkeypatch.setattr(scores_module, "get_broadcaster", lambda cam: bc)
+    client = TestClient(app)
+    path = f"/ws/scores/{settings.CAMERA_INDICES[0]}?rate=0&keypoints=true"
+    with client.websocket_connect(path) as ws:
+        bc.go.set()
+        msg = ws.receive_json()
+    assert msg["level"] == "normal" and msg["score"] == 0.1
+    assert len(msg["keypoints"]) == 1
+    bc._thread.join(timeout=5)
+    assert bc.status()["viewers"] == 0
@@ -0,0 +1,42 @@
+# tests/test_window.py
+
+import numpy as np
+import pytest
+
+from app.services.window import SequenceWindow, ScoreSmoother
+
+
+def test_window_view_is_ordered_and_shares_memory():
+    win = SequenceWindow(seq_len=3, feat_dim=2)
+    for i in range(5):
+        win.append(np.full(2, i, dtype=np.float32))
+        view = win.view()
+        assert view.shape == (1, 3, 2)
+        assert view.flags["C_CONTIGUOUS"]
+    assert win.full
+    np.testing.assert_array_equal(win.view()[0, :, 0], [2, 3, 4])
+    assert np.shares_memory(win.view(), win._buf)
+
+
+def test_window_slot_is_filled_in_place():
+    win = SequenceWindow(seq_len=2, feat_dim=3)
+    win.slot[:] = 7.0
+    win.advance()
+    assert len(win) == 1 and not win.full
+    np.testing.assert_array_equal(win.view()[0, -1], [7.0, 7.0, 7.0])
+
+
+def test_smoother_mean_matches_numpy():
+    rng    = np.random.default_rng(0)
+    scores = rng.random(50)
+    sm     = ScoreSmoother(window=5)
+    for i, s in enumerate(scores):
+        value = sm.update(s)
+        assert value == pytest.approx(scores[max(0, i - 4):i + 1].mean())
+
+
+def test_smoother_ema():
+    sm = ScoreSmoother(window=3, mode="ema", alpha=0.5)
+    sm.update(1.0)
+    assert sm.update(0.0) == pytest.approx(0.5)
+    assert sm.update(0.0) == pytest.approx(0.25)